@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+One-off backfill of the sparse Alive and BirthMonthDay attributes used by the
+Alive-PK-index and BirthMonthDay-PK-index GSIs.
+
+Run once after adding the indexes (see dynamodb_update.yaml) and before
+deploying the Lambdas that read from them. Re-run with --unmarked-only as a
+periodic maintenance job to mark living persons that were created without
+the Alive attribute.
+"""
+import os
+import sys
+import json
+import argparse
+import logging
+
+# Add the src directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+os.environ.setdefault('TABLE_NAME', 'Deadpool')
+from utils.dynamo import backfill_alive_index, index_unmarked_persons
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+def main():
+    parser = argparse.ArgumentParser(description='Backfill the Alive and BirthMonthDay attributes on person records')
+    parser.add_argument('--dry-run', action='store_true', help='Only report what would change')
+    parser.add_argument('--unmarked-only', action='store_true',
+                        help='Only mark living persons that have no Alive attribute yet')
+    args = parser.parse_args()
+    
+    if args.unmarked_only:
+        if args.dry_run:
+            parser.error('--dry-run is not supported with --unmarked-only')
+        counts = {'marked': index_unmarked_persons()}
+    else:
+        counts = backfill_alive_index(dry_run=args.dry_run)
+    print(json.dumps(counts, indent=2))
+
+if __name__ == "__main__":
+    main()
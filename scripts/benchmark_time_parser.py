@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark of the Wikidata time parser against the previous strptime chain.
+
+Uses a realistic mix of day, month and year precision birth/death values.
+"""
+import os
+import sys
+import random
+import timeit
+import argparse
+from datetime import datetime
+
+# Add the src directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+os.environ.setdefault('TABLE_NAME', 'Deadpool')
+from utils.wiki import parse_wikidata_dates, parse_wikidata_time
+
+def strptime_chain(value):
+    """The previous parser: strip the sign and try strptime formats in turn."""
+    if not value or "time" not in value:
+        return None
+    date_str = value["time"]
+    if date_str.startswith(("+", "-")):
+        date_str = date_str[1:]
+    try:
+        if date_str.endswith("-00-00T00:00:00Z"):
+            return datetime.strptime(date_str, "%Y-00-00T00:00:00Z")
+        elif date_str[5:7] != "00" and date_str.endswith("-00T00:00:00Z"):
+            return datetime.strptime(date_str, "%Y-%m-00T00:00:00Z")
+        return datetime.strptime(date_str, "%Y-%m-%dT%H:%M:%SZ")
+    except ValueError:
+        return None
+
+def make_values(count, seed=42):
+    """Build time datavalues: mostly day precision, some month and year precision."""
+    rng = random.Random(seed)
+    values = []
+    for _ in range(count):
+        year = rng.randint(1880, 2010)
+        kind = rng.random()
+        if kind < 0.85:
+            values.append({"time": f"+{year}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T00:00:00Z", "precision": 11})
+        elif kind < 0.93:
+            values.append({"time": f"+{year}-{rng.randint(1, 12):02d}-00T00:00:00Z", "precision": 10})
+        else:
+            values.append({"time": f"+{year}-00-00T00:00:00Z", "precision": 9})
+    return values
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the Wikidata time parser')
+    parser.add_argument('--values', type=int, default=10000, help='Number of time values per run')
+    parser.add_argument('--repeat', type=int, default=5, help='Number of timed runs, best is reported')
+    args = parser.parse_args()
+    
+    values = make_values(args.values)
+    assert [strptime_chain(value) for value in values] == [parse_wikidata_time(value) for value in values]
+    
+    candidates = [
+        ('strptime chain', lambda: [strptime_chain(value) for value in values]),
+        ('parse_wikidata_dates', lambda: parse_wikidata_dates(values)),
+        ('parse_wikidata_time', lambda: [parse_wikidata_time(value) for value in values]),
+    ]
+    baseline = None
+    for name, func in candidates:
+        best = min(timeit.repeat(func, number=1, repeat=args.repeat))
+        baseline = baseline or best
+        print(f"{name:22s} {best * 1e6 / args.values:8.2f} us/value  {baseline / best:5.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Recompute the Age of every person from the stored dates and report the diffs.
+
+Ages are computed in one bulk call (vectorized when NumPy is installed), so
+the whole table can be checked during maintenance and backfills. Pass
+--apply to write the corrected ages.
+"""
+import os
+import sys
+import json
+import argparse
+import logging
+from datetime import datetime
+
+# Add the src directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+os.environ.setdefault('TABLE_NAME', 'Deadpool')
+from utils.wiki import bulk_calculate_ages
+from utils.dynamo import table, mark_changed, update_persons_attributes, WRITE_FAILED, WRITE_SKIPPED
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+def scan_person_dates():
+    """Read PK, SK, Name, dates and Age of every person record."""
+    scan_params = {
+        'FilterExpression': 'begins_with(PK, :pk_prefix) AND SK = :sk',
+        'ProjectionExpression': 'PK, SK, #name, WikiPage, BirthDate, DeathDate, Age, Alive, BirthMonthDay',
+        'ExpressionAttributeNames': {'#name': 'Name'},
+        'ExpressionAttributeValues': {':pk_prefix': 'PERSON#', ':sk': 'DETAILS'}
+    }
+    persons = []
+    while True:
+        response = table.scan(**scan_params)
+        persons.extend(response.get('Items', []))
+        last_evaluated_key = response.get('LastEvaluatedKey')
+        if not last_evaluated_key:
+            return persons
+        scan_params['ExclusiveStartKey'] = last_evaluated_key
+
+def main():
+    parser = argparse.ArgumentParser(description='Recompute person ages from their stored dates')
+    parser.add_argument('--as-of', help='Date to age living persons as of (YYYY-MM-DD, default: today)')
+    parser.add_argument('--apply', action='store_true', help='Write the corrected ages')
+    args = parser.parse_args()
+    as_of = datetime.strptime(args.as_of, '%Y-%m-%d') if args.as_of else datetime.now()
+    
+    persons = [person for person in scan_person_dates() if person.get('BirthDate')]
+    ages = bulk_calculate_ages(
+        [person['BirthDate'] for person in persons],
+        [person.get('DeathDate') for person in persons],
+        as_of
+    )
+    
+    changed = []
+    for person, age in zip(persons, ages):
+        if str(person.get('Age')) != str(age):
+            logging.info(f"{person.get('Name', person['PK'])}: {person.get('Age')} -> {age}")
+            person['Age'] = age
+            mark_changed(person, 'Age')
+            changed.append(person)
+    
+    counts = {'checked': len(persons), 'changed': len(changed), 'written': 0, 'skipped': 0, 'failed': 0}
+    if args.apply:
+        for outcome in update_persons_attributes(changed):
+            status = outcome['status']
+            counts['failed' if status == WRITE_FAILED else 'skipped' if status == WRITE_SKIPPED else 'written'] += 1
+    print(json.dumps(counts, indent=2))
+
+if __name__ == "__main__":
+    main()
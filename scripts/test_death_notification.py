@@ -8,7 +8,9 @@ from botocore.exceptions import ClientError
 
 # Add the src directory to the Python path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+os.environ.setdefault('TABLE_NAME', 'Deadpool')
 from utils.sns import send_notification, get_sns_topic_arn
+from utils.dynamo import prepare_person_for_update
 
 def test_death_notification():
     """
@@ -30,14 +32,15 @@ def test_death_notification():
     }
     
     try:
-        # First, create/update the test person without death date
-        table.put_item(Item=test_person)
+        # First, create/update the test person without death date; prepare_person_for_update
+        # sets the sparse Alive and BirthMonthDay attributes so the alive index sees it
+        table.put_item(Item=prepare_person_for_update(test_person))
         print("Created test person record:")
         print(json.dumps(test_person, indent=2))
         
         # Now simulate finding their death
         test_person['DeathDate'] = datetime.now().strftime('%Y-%m-%d')
-        table.put_item(Item=test_person)
+        table.put_item(Item=prepare_person_for_update(test_person))
         print("\nUpdated test person with death date:")
         print(json.dumps(test_person, indent=2))
         
@@ -0,0 +1,109 @@
+"""
+AWS Lambda handler that rolls the Age of persons whose birthday is today
+
+Reads only today's birthdays from the birthday index and recomputes Age from
+the stored BirthDate, without any Wikipedia/Wikidata calls.
+"""
+
+import os
+import json
+import calendar
+import logging
+from datetime import datetime
+from typing import Dict, Any, List
+
+from utils.wiki import calculate_age
+from utils.dynamo import (
+    get_persons_with_birthday,
+    update_persons_attributes,
+    mark_changed,
+    WRITE_FAILED,
+    WRITE_SKIPPED
+)
+
+# Configure logging
+logger = logging.getLogger()
+logger.setLevel(os.environ.get('LOG_LEVEL', 'INFO'))
+
+def birthday_keys(today: datetime) -> List[str]:
+    """Get the MM-DD birthday keys whose age rolls over today.
+
+    Leap-day birthdays roll over on March 1 in common years.
+    """
+    keys = [today.strftime('%m-%d')]
+    if (today.month, today.day) == (3, 1) and not calendar.isleap(today.year):
+        keys.append('02-29')
+    return keys
+
+def roll_ages(today: datetime) -> Dict[str, int]:
+    """Recompute and write the Age of every living person with a birthday today.
+
+    Args:
+        today: Date to age persons as of
+
+    Returns:
+        Counts of persons read, updated, unchanged and failed
+    """
+    counts = {'read': 0, 'updated': 0, 'unchanged': 0, 'skipped': 0, 'failed': 0}
+    changed = []
+    
+    for month_day in birthday_keys(today):
+        persons = get_persons_with_birthday(month_day)
+        logger.info(f"Found {len(persons)} persons with a birthday on {month_day}")
+        counts['read'] += len(persons)
+        
+        for person in persons:
+            try:
+                birth_date = datetime.strptime(person['BirthDate'][:10], '%Y-%m-%d')
+            except (KeyError, TypeError, ValueError) as e:
+                logger.warning(f"Invalid BirthDate for {person.get('Name', 'Unknown')}: {e}")
+                counts['failed'] += 1
+                continue
+            
+            new_age = calculate_age(birth_date, as_of=today)
+            if str(person.get('Age')) == str(new_age):
+                counts['unchanged'] += 1
+                continue
+            
+            logger.info(f"Rolling age of {person.get('Name', 'Unknown')} from {person.get('Age')} to {new_age}")
+            person['Age'] = new_age
+            mark_changed(person, 'Age')
+            changed.append(person)
+    
+    for outcome in update_persons_attributes(changed):
+        status = outcome['status']
+        counts['failed' if status == WRITE_FAILED else 'skipped' if status == WRITE_SKIPPED else 'updated'] += 1
+    
+    return counts
+
+def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """AWS Lambda handler function.
+
+    Args:
+        event: Lambda event data; an optional 'date' (YYYY-MM-DD) replays another day
+        context: Lambda context object
+
+    Returns:
+        Response dictionary with the age roll counts
+    """
+    start_time = datetime.now()
+    today = start_time
+    if isinstance(event, dict) and event.get('date'):
+        today = datetime.strptime(event['date'], '%Y-%m-%d')
+    logger.info(f"Rolling ages for {today.strftime('%Y-%m-%d')}")
+    
+    try:
+        counts = roll_ages(today)
+    except Exception as e:
+        logger.error(f"Error rolling ages: {e}")
+        return {
+            'statusCode': 500,
+            'body': json.dumps({'error': str(e)})
+        }
+    
+    duration = (datetime.now() - start_time).total_seconds()
+    logger.info(f"Age roll complete - Duration: {duration:.2f}s, Counts: {json.dumps(counts)}")
+    return {
+        'statusCode': 200,
+        'body': json.dumps(dict(counts, duration=duration))
+    }
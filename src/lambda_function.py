@@ -4,21 +4,44 @@ AWS Lambda handler for updating person records with Wikipedia data
 
 import os
 import json
+import asyncio
+import math
 import logging
-import time
-import random
 import boto3
-from datetime import datetime
-from typing import Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional
 from utils.wiki import (
-    get_wiki_id_from_page,
-    get_birth_death_date,
-    calculate_age
+    resolve_titles,
+    get_entity_facts,
+    get_entities_facts,
+    get_latest_revisions,
+    revision_only_facts,
+    get_fact_date,
+    facts_digest,
+    calculate_age,
+    get_client_stats,
+    BIRTH_DATE_PROP,
+    DEATH_DATE_PROP,
+    LOOKUP_NO_ENTITY,
+    CircuitOpenError
 )
 from utils.dynamo import (
     get_persons_without_death_date,
     batch_update_persons,
-    format_date
+    async_get_persons_without_death_date,
+    async_batch_update_persons,
+    mark_changed,
+    get_changed_attributes,
+    format_date,
+    is_parallel_scan_cursor,
+    index_unmarked_persons,
+    ALIVE_INDEX_NAME,
+    ALIVE_INDEX_SWEEP,
+    FORCE_RECHECK,
+    LOOKUP_FAILURE_ATTRIBUTE,
+    LOOKUP_FAILURE_COUNT_ATTRIBUTE,
+    LOOKUP_RETRY_AT_ATTRIBUTE
 )
 
 # Custom JSON encoder for serializing non-standard types
@@ -35,23 +58,30 @@ logger = logging.getLogger()
 logger.setLevel(os.environ.get('LOG_LEVEL', 'INFO'))
 
 # Constants
-BIRTH_DATE_PROP = 'P569'
-DEATH_DATE_PROP = 'P570'
+WRITE_BATCH_SIZE = 25  # DynamoDB batch_write_item limit
+SHORT_CIRCUITED_KEY = '_shortCircuited'  # Set on persons whose Wikidata facts were unchanged
+PROCESSED_KEY = '_processed'  # Set on persons that were processed before a run stopped early
+RESTART_TOKEN = 'START'  # Pagination token that re-reads from the first person
 
-def process_person(person: Dict[str, Any]) -> Dict[str, Any]:
-    """Process a single person record.
+# Check entity revisions before downloading entities for persons with a stored WikiRevId
+REVISION_PROBE = os.environ.get('REVISION_PROBE', 'true').lower() == 'true'
+
+# Days before a failed WikiID lookup is retried, doubling with every failure in a row
+LOOKUP_RETRY_BASE_DAYS = int(os.environ.get('LOOKUP_RETRY_BASE_DAYS', '1'))
+LOOKUP_RETRY_MAX_DAYS = int(os.environ.get('LOOKUP_RETRY_MAX_DAYS', '30'))
+
+def _start_person(person: Dict[str, Any]) -> Optional[str]:
+    """Log a person and generate its WikiPage if missing.
 
     Args:
-        person: Person record from DynamoDB
+        person: Person record from DynamoDB, updated in place
 
     Returns:
-        Updated person record if changes needed, None if no changes
+        WikiPage title of the person, if any
     """
     person_id = person['PK'].replace('PERSON#', '')
     name = person.get('Name', '')
     wiki_page = person.get('WikiPage')
-    wiki_id = person.get('WikiID')
-    current_age = person.get('Age')
     
     logger.info("Processing person: %s (ID: %s)", name, person_id)
     logger.info("Current data: %s", json.dumps(person, default=str))
@@ -60,23 +90,141 @@ def process_person(person: Dict[str, Any]) -> Dict[str, Any]:
     if not wiki_page and name:
         wiki_page = name.replace(' ', '_')
         person['WikiPage'] = wiki_page
+        mark_changed(person, 'WikiPage')
         logger.info("Generated WikiPage %s for %s", wiki_page, name)
     
-    # Get Wiki ID if not present
-    if not wiki_id and wiki_page:
-        wiki_id = get_wiki_id_from_page(wiki_page)
-        if wiki_id:
-            person['WikiID'] = wiki_id
-            logger.info("Found Wiki ID %s for %s", wiki_id, name)
-    
-    if not wiki_id:
-        logger.warning("No Wiki ID available for %s (WikiPage: %s)", name, wiki_page)
-        return None
+    return wiki_page
+
+def _set_wiki_id(person: Dict[str, Any], wiki_id: Optional[str]) -> None:
+    """Store a freshly resolved WikiID on a person."""
+    if wiki_id:
+        person['WikiID'] = wiki_id
+        mark_changed(person, 'WikiID')
+        logger.info("Found Wiki ID %s for %s", wiki_id, person.get('Name', ''))
+
+def lookup_retry_days(failure_count: int) -> int:
+    """Get the back-off in days after a number of consecutive lookup failures."""
+    return min(LOOKUP_RETRY_BASE_DAYS * 2 ** max(failure_count - 1, 0), LOOKUP_RETRY_MAX_DAYS)
+
+def record_lookup_failure(person: Dict[str, Any], reason: str, today: datetime = None) -> None:
+    """Store a failed WikiID lookup so the reader skips the person until its retry date.
+
+    Args:
+        person: Person record, updated in place
+        reason: LOOKUP_* reason returned by the title resolution
+        today: Date of the failure (defaults to now)
+    """
+    failure_count = int(person.get(LOOKUP_FAILURE_COUNT_ATTRIBUTE) or 0) + 1
+    retry_at = format_date((today or datetime.now()) + timedelta(days=lookup_retry_days(failure_count)))
+    person[LOOKUP_FAILURE_ATTRIBUTE] = reason
+    person[LOOKUP_FAILURE_COUNT_ATTRIBUTE] = failure_count
+    person[LOOKUP_RETRY_AT_ATTRIBUTE] = retry_at
+    mark_changed(person, LOOKUP_FAILURE_ATTRIBUTE, LOOKUP_FAILURE_COUNT_ATTRIBUTE, LOOKUP_RETRY_AT_ATTRIBUTE)
+    logger.warning("WikiID lookup failed for %s (%s, %d in a row), retrying on %s",
+                   person.get('Name', ''), reason, failure_count, retry_at)
+
+def clear_lookup_failure(person: Dict[str, Any]) -> None:
+    """Remove a stored lookup failure after a successful lookup."""
+    attributes = [
+        attribute for attribute in (LOOKUP_FAILURE_ATTRIBUTE, LOOKUP_FAILURE_COUNT_ATTRIBUTE, LOOKUP_RETRY_AT_ATTRIBUTE)
+        if person.get(attribute) is not None
+    ]
+    for attribute in attributes:
+        person[attribute] = None
+    mark_changed(person, *attributes)
+
+def apply_title_resolution(person: Dict[str, Any], resolution: Optional[Dict[str, Any]]) -> None:
+    """Store the outcome of a WikiPage lookup on a person.
+
+    A missing resolution means the request itself failed; that is transient,
+    so nothing is recorded and the lookup is tried again on the next run.
+    """
+    if not resolution:
+        return
+    if resolution.get('wiki_id'):
+        _set_wiki_id(person, resolution['wiki_id'])
+        clear_lookup_failure(person)
+    else:
+        record_lookup_failure(person, resolution.get('failure') or LOOKUP_NO_ENTITY)
+
+def _lookup_failure_update(person: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Return the person for writing if a lookup failure was just recorded on it."""
+    return person if LOOKUP_FAILURE_ATTRIBUTE in get_changed_attributes(person) else None
+
+def _stored_age_is_current(person: Dict[str, Any]) -> bool:
+    """Check whether the stored Age matches the stored BirthDate and DeathDate today.
+
+    This needs no network, and it also catches ages left stale by runs that
+    missed a birthday.
+    """
+    try:
+        birth_date = datetime.strptime(person['BirthDate'][:10], '%Y-%m-%d')
+        death_date = datetime.strptime(person['DeathDate'][:10], '%Y-%m-%d') if person.get('DeathDate') else None
+    except (KeyError, TypeError, ValueError):
+        return False
+    return str(person.get('Age')) == str(calculate_age(birth_date, death_date))
+
+def _can_short_circuit(person: Dict[str, Any], facts: Optional[Dict[str, Any]]) -> bool:
+    """Check whether unchanged facts would leave the person untouched.
+
+    A stored digest is required, and the stored Age must still be right:
+    the age of a living person changes on their birthday even when Wikidata
+    does not.
+    """
+    if not facts or not person.get('WikiDigest'):
+        return False
+    return _stored_age_is_current(person)
+
+def _set_fact_versions(person: Dict[str, Any], digest: str, revision: Optional[int]) -> bool:
+    """Store the facts digest and entity revision, returning True if either changed."""
+    changed = False
+    if person.get('WikiDigest') != digest:
+        person['WikiDigest'] = digest
+        mark_changed(person, 'WikiDigest')
+        changed = True
+    if revision is not None and str(person.get('WikiRevId')) != str(revision):
+        person['WikiRevId'] = revision
+        mark_changed(person, 'WikiRevId')
+        changed = True
+    return changed
+
+def apply_entity_facts(person: Dict[str, Any], facts: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Update a person from Wikidata entity facts.
+
+    The entity revision and the digest of its facts are compared first; when
+    they match the stored ones, date parsing, age computation and the write
+    are skipped. This step does no I/O, so the sync and async engines share it.
+
+    Args:
+        person: Person record with a WikiID, updated in place
+        facts: Entity facts for the person's WikiID
+
+    Returns:
+        Updated person record if changes needed, None if no changes
+    """
+    name = person.get('Name', '')
+    current_age = person.get('Age')
     
-    # Get birth and death dates
     try:
-        birth_date = get_birth_death_date(BIRTH_DATE_PROP, wiki_id)
-        death_date = get_birth_death_date(DEATH_DATE_PROP, wiki_id)
+        if _can_short_circuit(person, facts):
+            revision = facts.get('lastrevid')
+            if revision is not None and str(person.get('WikiRevId')) == str(revision):
+                person[SHORT_CIRCUITED_KEY] = True
+                logger.info("Wikidata revision %s unchanged for %s", revision, name)
+                return None
+            digest = facts_digest(facts)
+            if digest == person['WikiDigest']:
+                person[SHORT_CIRCUITED_KEY] = True
+                logger.info("Wikidata facts unchanged for %s", name)
+                # Only remember the new revision so it matches next time
+                return person if _set_fact_versions(person, digest, revision) else None
+        
+        if facts and facts.get('revisionOnly'):
+            logger.warning("Only the revision of %s is known, skipping %s", facts.get('id'), name)
+            return None
+        
+        birth_date = get_fact_date(facts, BIRTH_DATE_PROP)
+        death_date = get_fact_date(facts, DEATH_DATE_PROP)
         
         needs_update = False
         
@@ -84,6 +232,7 @@ def process_person(person: Dict[str, Any]) -> Dict[str, Any]:
             new_birth_date = format_date(birth_date)
             if person.get('BirthDate') != new_birth_date:
                 person['BirthDate'] = new_birth_date
+                mark_changed(person, 'BirthDate')
                 logger.info("Updated birth date to %s for %s", new_birth_date, name)
                 needs_update = True
         
@@ -91,6 +240,7 @@ def process_person(person: Dict[str, Any]) -> Dict[str, Any]:
             new_death_date = format_date(death_date)
             if person.get('DeathDate') != new_death_date:
                 person['DeathDate'] = new_death_date
+                mark_changed(person, 'DeathDate')
                 logger.info("Found death date %s for %s", new_death_date, name)
                 needs_update = True
             
@@ -99,8 +249,12 @@ def process_person(person: Dict[str, Any]) -> Dict[str, Any]:
             new_age = calculate_age(birth_date, death_date)
             if str(current_age) != str(new_age):  # Compare as strings since DynamoDB stores numbers as strings
                 person['Age'] = new_age
+                mark_changed(person, 'Age')
                 logger.info("Updated age from %s to %d for %s", current_age, new_age, name)
                 needs_update = True
+        
+        if facts and _set_fact_versions(person, facts_digest(facts), facts.get('lastrevid')):
+            needs_update = True
                 
         if needs_update:
             logger.info("Changes detected for %s. Updated data: %s", name, json.dumps(person, default=str))
@@ -113,21 +267,206 @@ def process_person(person: Dict[str, Any]) -> Dict[str, Any]:
     logger.info("No changes needed for %s", name)
     return None
 
-def process_records(persons: List[Dict[str, Any]], batch_size: int = 10) -> tuple[int, int]:
+def count_short_circuited(persons: List[Dict[str, Any]]) -> int:
+    """Count persons whose processing was skipped because their facts were unchanged."""
+    return sum(1 for person in persons if person.get(SHORT_CIRCUITED_KEY))
+
+def process_person(person: Dict[str, Any], facts: Optional[Dict[str, Any]] = None,
+                   resolve_wiki_id: bool = True) -> Dict[str, Any]:
+    """Process a single person record.
+
+    Args:
+        person: Person record from DynamoDB
+        facts: Prefetched entity facts for the person's WikiID, if available
+        resolve_wiki_id: Look up a missing WikiID; False when a batch lookup already failed
+
+    Returns:
+        Updated person record if changes needed, None if no changes
+
+    Raises:
+        CircuitOpenError: Wikimedia is failing, so the person could not be processed
+    """
+    wiki_page = _start_person(person)
+    
+    # Get Wiki ID if not present
+    if not person.get('WikiID') and wiki_page and resolve_wiki_id:
+        apply_title_resolution(person, resolve_titles([wiki_page]).get(wiki_page))
+    
+    wiki_id = person.get('WikiID')
+    if not wiki_id:
+        logger.warning("No Wiki ID available for %s (WikiPage: %s)", person.get('Name', ''), wiki_page)
+        return _lookup_failure_update(person)
+    
+    # One entity fetch covers both birth and death dates
+    if not facts or facts.get('id') != wiki_id:
+        try:
+            facts = get_entity_facts(wiki_id)
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            logger.error("Error processing dates for %s: %s", person.get('Name', ''), e)
+            return None
+    
+    return apply_entity_facts(person, facts)
+
+async def async_process_person(person: Dict[str, Any], client: Any, facts: Optional[Dict[str, Any]] = None,
+                               resolve_wiki_id: bool = True) -> Optional[Dict[str, Any]]:
+    """Async variant of process_person using an AsyncWikiClient."""
+    wiki_page = _start_person(person)
+    
+    # Get Wiki ID if not present
+    if not person.get('WikiID') and wiki_page and resolve_wiki_id:
+        apply_title_resolution(person, (await client.resolve_titles([wiki_page])).get(wiki_page))
+    
+    wiki_id = person.get('WikiID')
+    if not wiki_id:
+        logger.warning("No Wiki ID available for %s (WikiPage: %s)", person.get('Name', ''), wiki_page)
+        return _lookup_failure_update(person)
+    
+    # One entity fetch covers both birth and death dates
+    if not facts or facts.get('id') != wiki_id:
+        try:
+            facts = await client.get_entity_facts(wiki_id)
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            logger.error("Error processing dates for %s: %s", person.get('Name', ''), e)
+            return None
+    
+    return apply_entity_facts(person, facts)
+
+def _pending_wiki_id_lookups(persons: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Generate missing WikiPages and return persons that still need a WikiID."""
+    pending = []
+    for person in persons:
+        if person.get('WikiID'):
+            continue
+        if not person.get('WikiPage') and person.get('Name'):
+            person['WikiPage'] = person['Name'].replace(' ', '_')
+            mark_changed(person, 'WikiPage')
+            logger.info("Generated WikiPage %s for %s", person['WikiPage'], person['Name'])
+        if person.get('WikiPage'):
+            pending.append(person)
+    return pending
+
+def resolve_batch_wiki_ids(persons: List[Dict[str, Any]]) -> None:
+    """Look up missing WikiIDs for a batch of persons in bulk.
+
+    Args:
+        persons: Person records, updated in place with WikiPage/WikiID and lookup failures
+    """
+    pending = _pending_wiki_id_lookups(persons)
+    if not pending:
+        return
+    
+    resolved = resolve_titles([person['WikiPage'] for person in pending])
+    for person in pending:
+        apply_title_resolution(person, resolved.get(person['WikiPage']))
+
+def revision_probe_candidates(batch: List[Dict[str, Any]]) -> Dict[str, str]:
+    """Find entities whose download could be skipped if their revision is unchanged.
+
+    Only QIDs where every person of the batch has the same stored WikiRevId
+    and could be short-circuited qualify.
+
+    Args:
+        batch: Person records with resolved WikiIDs
+
+    Returns:
+        Dict mapping QID to the stored revision as a string
+    """
+    candidates = {}
+    excluded = set()
+    for person in batch:
+        wiki_id = person.get('WikiID')
+        if not wiki_id:
+            continue
+        revision = person.get('WikiRevId')
+        if revision is None or not _can_short_circuit(person, {'id': wiki_id}):
+            excluded.add(wiki_id)
+        elif candidates.setdefault(wiki_id, str(revision)) != str(revision):
+            excluded.add(wiki_id)
+    return {wiki_id: revision for wiki_id, revision in candidates.items() if wiki_id not in excluded}
+
+def unchanged_entity_facts(candidates: Dict[str, str], revisions: Dict[str, int]) -> Dict[str, Dict[str, Any]]:
+    """Build revision-only facts for candidates whose latest revision matches the stored one."""
+    unchanged = {
+        wiki_id: revision_only_facts(wiki_id, revisions[wiki_id])
+        for wiki_id, stored in candidates.items()
+        if wiki_id in revisions and str(revisions[wiki_id]) == stored
+    }
+    logger.info("Revision probe: %d of %d entities unchanged", len(unchanged), len(candidates))
+    return unchanged
+
+def prefetch_batch(batch: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Resolve missing WikiIDs and fetch entities for a whole batch.
+
+    When REVISION_PROBE is enabled, entities whose latest revision matches
+    the persons' stored WikiRevId are not downloaded.
+
+    Args:
+        batch: Person records, updated in place with WikiPage/WikiID
+
+    Returns:
+        Dict mapping QID to entity facts for the batch
+    """
+    resolve_batch_wiki_ids(batch)
+    wiki_ids = [person['WikiID'] for person in batch if person.get('WikiID')]
+    if not wiki_ids:
+        return {}
+    
+    prefetched = {}
+    revisions = {}
+    candidates = revision_probe_candidates(batch) if REVISION_PROBE else {}
+    if candidates:
+        revisions = get_latest_revisions(list(candidates))
+        prefetched = unchanged_entity_facts(candidates, revisions)
+    
+    changed_ids = [wiki_id for wiki_id in wiki_ids if wiki_id not in prefetched]
+    if changed_ids:
+        prefetched.update(get_entities_facts(changed_ids, min_revisions=revisions))
+    return prefetched
+
+def _process_person_safely(person: Dict[str, Any], prefetched: Dict[str, Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Process a person after a batch prefetch, logging instead of raising on errors.
+
+    Only CircuitOpenError is raised, so the run can stop early.
+    """
+    try:
+        # WikiID lookups were already attempted by prefetch_batch
+        updated_person = process_person(person, prefetched.get(person.get('WikiID')), resolve_wiki_id=False)
+    except CircuitOpenError:
+        raise
+    except Exception as e:
+        logger.error("Error processing person %s: %s",
+                    person.get('Name', 'Unknown'), e)
+        updated_person = None
+    person[PROCESSED_KEY] = True
+    return updated_person
+
+def process_records(persons: List[Dict[str, Any]], batch_size: int = 10, max_workers: int = 1) -> tuple[int, int]:
     """Process a list of person records in batches.
 
+    Processing stops early when a Wikimedia circuit opens; persons that were
+    processed are marked with PROCESSED_KEY so the run can be resumed.
+
     Args:
         persons: List of person records to process
         batch_size: Number of records to process in each batch
+        max_workers: Number of worker threads; 1 processes everything serially
 
     Returns:
         Tuple of (success_count, failure_count)
     """
+    if max_workers > 1:
+        return process_records_concurrently(persons, batch_size, max_workers)
+
     total_success = 0
     total_failure = 0
     updates = []
+    circuit_error = None
     
-    # Process in batches to avoid rate limiting
+    # Process in batches; request pacing is handled by the Wikimedia rate limiter
     for i in range(0, len(persons), batch_size):
         batch = persons[i:i+batch_size]
         batch_number = (i // batch_size) + 1
@@ -135,23 +474,27 @@ def process_records(persons: List[Dict[str, Any]], batch_size: int = 10) -> tupl
         
         logger.info(f"Processing batch {batch_number}/{total_batches} ({len(batch)} records)")
         
-        # Add a delay between batches to avoid rate limiting
-        if i > 0:
-            delay = random.uniform(2.0, 5.0)
-            logger.info(f"Pausing for {delay:.2f} seconds between batches")
-            time.sleep(delay)
-        
-        # Process each person in the batch
         batch_updates = []
-        for person in batch:
+        try:
+            # Resolve missing WikiIDs and fetch entities for the whole batch
+            # in as few requests as possible
             try:
-                updated_person = process_person(person)
+                prefetched = prefetch_batch(batch)
+            except CircuitOpenError:
+                raise
+            except Exception as e:
+                # Like a failed lookup: the persons of this batch are processed without prefetched facts
+                logger.error("Error prefetching batch %d: %s", batch_number, e)
+                prefetched = {}
+            
+            # Process each person in the batch
+            for person in batch:
+                updated_person = _process_person_safely(person, prefetched)
                 if updated_person:
                     batch_updates.append(updated_person)
                     updates.append(updated_person)
-            except Exception as e:
-                logger.error("Error processing person %s: %s",
-                            person.get('Name', 'Unknown'), e)
+        except CircuitOpenError as e:
+            circuit_error = e
         
         # Update DynamoDB with batch results
         if batch_updates:
@@ -168,6 +511,10 @@ def process_records(persons: List[Dict[str, Any]], batch_size: int = 10) -> tupl
             )
         else:
             logger.info(f"Batch {batch_number} complete: no updates needed")
+        
+        if circuit_error:
+            logger.warning("Stopping early after batch %d: %s", batch_number, circuit_error)
+            break
     
     if updates:
         logger.info(f"All batches complete: {len(updates)} total updates processed")
@@ -176,125 +523,286 @@ def process_records(persons: List[Dict[str, Any]], batch_size: int = 10) -> tupl
         
     return total_success, total_failure
 
-def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
-    """AWS Lambda handler function.
+def process_records_concurrently(persons: List[Dict[str, Any]], batch_size: int = 10,
+                                 max_workers: int = 8) -> tuple[int, int]:
+    """Process person records on a bounded thread pool.
+
+    Batches are prefetched in parallel, then every person is processed as an
+    independent task. Prefetching is where all the network I/O happens, so
+    batches are split until every worker has one to fetch. Results are
+    collected on the calling thread and written to DynamoDB in chunks of
+    WRITE_BATCH_SIZE as they come in. When a Wikimedia circuit opens, queued
+    prefetches are dropped, while batches that were already prefetched are
+    still processed and written. Prefetches start in order, so the processed
+    persons stay a prefix of the page as far as possible and resume_token
+    loses little work.
 
     Args:
-        event: Lambda event data
-        context: Lambda context object
+        persons: List of person records to process
+        batch_size: Maximum number of records prefetched together
+        max_workers: Maximum number of worker threads
 
     Returns:
-        Response dictionary with processing results
+        Tuple of (success_count, failure_count)
     """
-    start_time = datetime.now()
-    total_processed = 0
-    total_updated = 0
-    total_failed = 0
+    total_success = 0
+    total_failure = 0
+    total_updates = 0
+    pending_updates = []
+    # With fewer batches than workers, the extra workers would have nothing to fetch
+    prefetch_size = max(1, min(batch_size, math.ceil(len(persons) / max_workers)))
+    batches = [persons[i:i+prefetch_size] for i in range(0, len(persons), prefetch_size)]
     
-    # Get batch size from environment variable or use default
-    batch_size = int(os.environ.get('BATCH_SIZE', '10'))
-    logger.info(f"Using batch size of {batch_size}")
+    logger.info(f"Processing {len(persons)} records in {len(batches)} batches of up to {prefetch_size} "
+                f"with {max_workers} workers")
     
-    # Check if this is a continuation of a previous run
-    start_key = None
+    def flush_updates():
+        nonlocal total_success, total_failure, pending_updates
+        if not pending_updates:
+            return
+        success, failure = batch_update_persons(pending_updates)
+        total_success += success
+        total_failure += failure
+        logger.info(
+            f"Progress - Written: {len(pending_updates)}, Updated: {success}, Failed: {failure}, "
+            f"Running Total - Updated: {total_success}, Failed: {total_failure}"
+        )
+        pending_updates = []
     
-    # Extract pagination token from event if present
-    if event and isinstance(event, dict):
-        body = event.get('body')
-        if body and isinstance(body, str):
-            try:
-                body_json = json.loads(body)
-                if isinstance(body_json, dict):
-                    token = body_json.get('paginationToken')
-                    if token:
-                        # Convert string token to DynamoDB key
-                        if isinstance(token, str):
-                            if token.startswith(('PERSON#', 'PLAYER#')):
-                                # It's a PK, create a proper key
-                                start_key = {'PK': token, 'SK': 'DETAILS'}
-                                logger.info(f"Created proper key from PK: {start_key}")
-                            else:
-                                # Try to parse it as JSON
-                                try:
-                                    start_key = json.loads(token)
-                                    logger.info(f"Parsed token as JSON: {start_key}")
-                                except Exception as e:
-                                    logger.error(f"Failed to parse token as JSON: {e}")
-                                    # Use as is
-                                    start_key = token
-                        else:
-                            start_key = token
-                        
-                        logger.info(f"Continuing from pagination token: {token}")
-            except json.JSONDecodeError:
-                pass
-        elif isinstance(event, dict):
-            token = event.get('paginationToken')
-            if token:
-                # Convert string token to DynamoDB key
-                if isinstance(token, str):
-                    if token.startswith(('PERSON#', 'PLAYER#')):
-                        # It's a PK, create a proper key
-                        start_key = {'PK': token, 'SK': 'DETAILS'}
-                        logger.info(f"Created proper key from PK: {start_key}")
-                    else:
-                        # Try to parse it as JSON
-                        try:
-                            start_key = json.loads(token)
-                            logger.info(f"Parsed token as JSON: {start_key}")
-                        except Exception as e:
-                            logger.error(f"Failed to parse token as JSON: {e}")
-                            # Use as is
-                            start_key = token
-                else:
-                    start_key = token
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Maps prefetch futures to their batch and person futures to None
+        running = {executor.submit(prefetch_batch, batch): batch for batch in batches}
+        circuit_error = None
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                batch = running.pop(future)
+                try:
+                    result = future.result()
+                except CircuitOpenError as e:
+                    if not circuit_error:
+                        # Drop queued work; running tasks finish and are still collected
+                        circuit_error = e
+                        logger.warning("Stopping early: %s", e)
+                        for queued in [queued for queued in running if queued.cancel()]:
+                            running.pop(queued)
+                    continue
+                except Exception as e:
+                    if batch is None:
+                        raise
+                    logger.error("Error prefetching batch: %s", e)
+                    result = {}
                 
-                logger.info(f"Continuing from pagination token: {token}")
-    
-    try:
-        # Get records that need processing, with a limit to prevent timeouts
-        max_items = int(os.environ.get('MAX_ITEMS_PER_RUN', '100'))
-        logger.info(f"Using maximum of {max_items} items per run")
-        
-        # Get records with pagination
-        persons, next_token = get_persons_without_death_date(max_items=max_items, start_key=start_key)
+                if batch is not None:
+                    for person in batch:
+                        running[executor.submit(_process_person_safely, person, result)] = None
+                    continue
+                
+                updated_person = result
+                if updated_person:
+                    pending_updates.append(updated_person)
+                    total_updates += 1
+                    if len(pending_updates) >= WRITE_BATCH_SIZE:
+                        flush_updates()
         
-        if persons:
-            total_processed = len(persons)
-            logger.info(f"Retrieved {total_processed} records to process")
-            
-            # Process records in batches
-            success_count, failure_count = process_records(persons, batch_size)
-            total_updated = success_count
-            total_failed = failure_count
-            
-            logger.info(
-                "Final Summary - Processed: %d, Updated: %d, Failed: %d",
-                total_processed, total_updated, total_failed
-            )
-        else:
-            logger.info("No records to process")
+        flush_updates()
     
-    except Exception as e:
-        logger.error("Error in main processing loop: %s", e)
-        return {
-            'statusCode': 500,
-            'body': json.dumps({
-                'error': str(e),
-                'processed': total_processed,
-                'updated': total_updated,
-                'failed': total_failed,
-                'duration': (datetime.now() - start_time).total_seconds(),
-                'hasMoreRecords': next_token is not None,
-                'paginationToken': next_token
-            })
-        }
+    if total_updates:
+        logger.info(f"All batches complete: {total_updates} total updates processed")
+    else:
+        logger.info("All batches complete: no updates needed")
+    
+    return total_success, total_failure
+
+def _token_to_start_key(token: Any) -> Any:
+    """Convert a pagination token into a DynamoDB start key."""
+    if isinstance(token, str):
+        if token == RESTART_TOKEN:
+            logger.info("Restarting from the first person")
+            return None
+        if token.startswith(('PERSON#', 'PLAYER#')):
+            # It's a PK, create a proper key
+            start_key = {'PK': token, 'SK': 'DETAILS'}
+            logger.info(f"Created proper key from PK: {start_key}")
+            return start_key
+        # Try to parse it as JSON
+        try:
+            start_key = json.loads(token)
+            logger.info(f"Parsed token as JSON: {start_key}")
+            return start_key
+        except Exception as e:
+            logger.error(f"Failed to parse token as JSON: {e}")
+            # Use as is
+            return token
+    return token
+
+def resume_token(persons: List[Dict[str, Any]], start_key: Any, next_token: Any) -> Any:
+    """Get the pagination token that resumes a run at its first unprocessed person.
+
+    Tokens are exclusive start keys, so the run resumes after the last person
+    of the processed prefix of the page. Without such a prefix, and for
+    parallel scan cursors, which track segments rather than persons, the page
+    is re-read from where it started; RESTART_TOKEN stands for the start of a
+    fresh run. The token is never None while persons are left unprocessed.
+
+    Args:
+        persons: Person records of this run, in read order
+        start_key: Start key this run read from
+        next_token: Token of the page after this run's page
+
+    Returns:
+        Pagination token, next_token when every person was processed
+    """
+    processed = 0
+    while processed < len(persons) and persons[processed].get(PROCESSED_KEY):
+        processed += 1
+    if processed == len(persons):
+        return next_token
+    
+    parallel_scan = is_parallel_scan_cursor(start_key) or (
+        isinstance(next_token, str) and is_parallel_scan_cursor(_token_to_start_key(next_token))
+    )
+    if processed and not parallel_scan:
+        return persons[processed - 1]['PK']
+    if is_parallel_scan_cursor(start_key):
+        return json.dumps(start_key, default=str)
+    if isinstance(start_key, dict) and 'PK' in start_key:
+        return start_key['PK']
+    if isinstance(start_key, str):
+        return start_key
+    if start_key:
+        return json.dumps(start_key, default=str)
+    return RESTART_TOKEN
+
+def get_start_key(event: Dict[str, Any]) -> Any:
+    """Extract the pagination start key from a Lambda event, if present.
+
+    Args:
+        event: Lambda event data
+
+    Returns:
+        DynamoDB start key, or None for a fresh run
+    """
+    if not event or not isinstance(event, dict):
+        return None
+    
+    token = None
+    body = event.get('body')
+    if body and isinstance(body, str):
+        try:
+            body_json = json.loads(body)
+            if isinstance(body_json, dict):
+                token = body_json.get('paginationToken')
+        except json.JSONDecodeError:
+            pass
+    else:
+        token = event.get('paginationToken')
     
+    if not token:
+        return None
+    
+    start_key = _token_to_start_key(token)
+    logger.info(f"Continuing from pagination token: {token}")
+    return start_key
+
+def is_force_recheck(event: Dict[str, Any]) -> bool:
+    """Check whether a run should also re-check persons whose WikiID lookup is backed off.
+
+    Set with FORCE_RECHECK or a ``forceRecheck`` flag in the event or its JSON body.
+    """
+    if FORCE_RECHECK:
+        return True
+    if not event or not isinstance(event, dict):
+        return False
+    body = event.get('body')
+    if body and isinstance(body, str):
+        try:
+            body_json = json.loads(body)
+            if isinstance(body_json, dict) and body_json.get('forceRecheck'):
+                return True
+        except json.JSONDecodeError:
+            pass
+    return bool(event.get('forceRecheck'))
+
+def sweep_unmarked_persons(start_key: Any) -> None:
+    """Mark persons created elsewhere for the alive index before a fresh run reads it.
+
+    Only runs when ALIVE_INDEX_SWEEP is enabled, since it reads every person.
+    Continuation runs skip the sweep; the first page of a run already did it.
+    """
+    if start_key is not None or not ALIVE_INDEX_NAME or not ALIVE_INDEX_SWEEP:
+        return
+    try:
+        index_unmarked_persons()
+    except Exception as e:
+        logger.error("Error marking persons for the alive index: %s", e)
+
+def _stopped_early_state(persons: List[Dict[str, Any]], start_key: Any, next_token: Any) -> tuple[int, bool, Any]:
+    """Get the processed count, whether the run stopped early and the token to continue with."""
+    total_processed = sum(1 for person in persons if person.get(PROCESSED_KEY))
+    if total_processed == len(persons):
+        return total_processed, False, next_token
+    token = resume_token(persons, start_key, next_token)
+    logger.warning("Processed %d of %d records before a Wikimedia circuit opened. Resume token: %s",
+                   total_processed, len(persons), token)
+    return total_processed, True, token
+
+def _log_final_summary(total_processed: int, total_updated: int, total_failed: int,
+                       total_short_circuited: int = 0) -> None:
+    """Log the per-run summary line."""
+    client_stats = get_client_stats()
+    logger.info(
+        "Final Summary - Processed: %d, Updated: %d, Failed: %d, Unchanged (short-circuited): %d, "
+        "Wiki concurrency: %d, Collapsed lookups: %d",
+        total_processed, total_updated, total_failed, total_short_circuited,
+        client_stats['concurrency']['limit'],
+        sum(kind['collapsed'] for kind in client_stats['singleFlight'].values())
+    )
+
+def _error_response(error: Exception, start_time: datetime, total_processed: int, total_updated: int,
+                    total_failed: int, next_token: Any) -> Dict[str, Any]:
+    """Build the response returned when the main processing loop fails."""
+    logger.error("Error in main processing loop: %s", error)
+    return {
+        'statusCode': 500,
+        'body': json.dumps({
+            'error': str(error),
+            'processed': total_processed,
+            'updated': total_updated,
+            'failed': total_failed,
+            'duration': (datetime.now() - start_time).total_seconds(),
+            'hasMoreRecords': next_token is not None,
+            'paginationToken': next_token
+        })
+    }
+
+def finish_run(event: Dict[str, Any], context: Any, start_time: datetime, total_processed: int,
+               total_updated: int, total_failed: int, next_token: Any,
+               total_short_circuited: int = 0, circuit_open: bool = False) -> Dict[str, Any]:
+    """Log the run, self-invoke for the next page if enabled, and build the response.
+
+    Shared by the sync and async engines so both return identical bodies.
+
+    Args:
+        event: Lambda event data
+        context: Lambda context object
+        start_time: When the invocation started
+        total_processed: Records processed in this invocation
+        total_updated: Records updated in this invocation
+        total_failed: Records that failed to update in this invocation
+        next_token: Pagination token for the next page, or None when done
+        total_short_circuited: Records skipped because their Wikidata facts were unchanged
+        circuit_open: The run stopped early because Wikimedia was failing; no self-invocation
+
+    Returns:
+        Response dictionary with processing results
+    """
     duration = (datetime.now() - start_time).total_seconds()
     logger.info(
         "Execution complete - Duration: %.2fs, Processed: %d, Updated: %d, Failed: %d",
         duration, total_processed, total_updated, total_failed
     )
+    logger.info("Wiki client stats: %s", json.dumps(get_client_stats()))
     
     # Check if there are more records to process
     has_more = next_token is not None
@@ -309,7 +817,10 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         running_total_updated = int(event.get('runningTotalUpdated', 0)) + total_updated
         running_total_failed = int(event.get('runningTotalFailed', 0)) + total_failed
         
-        if auto_paginate and invocation_count < max_invocations:
+        if circuit_open:
+            # A new invocation would hit the same failing service; resume with the token instead
+            logger.warning("Stopped early because a Wikimedia circuit is open. Not self-invoking for next batch.")
+        elif auto_paginate and invocation_count < max_invocations:
             logger.info(f"Auto-pagination enabled. Self-invoking for next batch. Invocation {invocation_count}/{max_invocations}")
             
             # Create payload for next invocation
@@ -320,6 +831,8 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 'runningTotalUpdated': running_total_updated,
                 'runningTotalFailed': running_total_failed
             }
+            if is_force_recheck(event):
+                payload['forceRecheck'] = True
             
             try:
                 # Get the function name from the context or environment
@@ -354,6 +867,8 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             'processed': total_processed,
             'updated': total_updated,
             'failed': total_failed,
+            'shortCircuited': total_short_circuited,
+            'circuitOpen': circuit_open,
             'duration': duration,
             'hasMoreRecords': has_more,
             'invocationCount': event.get('invocationCount', 0) + 1,
@@ -369,6 +884,8 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             'processed': total_processed,
             'updated': total_updated,
             'failed': total_failed,
+            'shortCircuited': total_short_circuited,
+            'circuitOpen': circuit_open,
             'duration': duration,
             'hasMoreRecords': True,
             'paginationToken': next_token,
@@ -378,4 +895,244 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             'runningTotalFailed': running_total_failed
         })
     
-    return response
\ No newline at end of file
+    return response
+
+def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """AWS Lambda handler function.
+
+    Runs the synchronous engine unless ENGINE=async is set, in which case the
+    run is delegated to async_lambda_handler.
+
+    Args:
+        event: Lambda event data
+        context: Lambda context object
+
+    Returns:
+        Response dictionary with processing results
+    """
+    if os.environ.get('ENGINE', 'sync').lower() == 'async':
+        logger.info("Using async engine")
+        return asyncio.run(async_lambda_handler(event, context))
+    
+    start_time = datetime.now()
+    total_processed = 0
+    total_updated = 0
+    total_failed = 0
+    total_short_circuited = 0
+    circuit_open = False
+    next_token = None
+    
+    # Get batch size from environment variable or use default
+    batch_size = int(os.environ.get('BATCH_SIZE', '10'))
+    logger.info(f"Using batch size of {batch_size}")
+    max_workers = int(os.environ.get('PROCESS_WORKERS', '1'))
+    logger.info(f"Using {max_workers} worker thread(s)")
+    
+    # Check if this is a continuation of a previous run
+    start_key = get_start_key(event)
+    
+    try:
+        # Get records that need processing, with a limit to prevent timeouts
+        max_items = int(os.environ.get('MAX_ITEMS_PER_RUN', '100'))
+        logger.info(f"Using maximum of {max_items} items per run")
+        
+        sweep_unmarked_persons(start_key)
+        
+        # Get records with pagination
+        persons, next_token = get_persons_without_death_date(
+            max_items=max_items, start_key=start_key, force_recheck=is_force_recheck(event)
+        )
+        
+        if persons:
+            total_processed = len(persons)
+            logger.info(f"Retrieved {total_processed} records to process")
+            
+            # Process records in batches
+            success_count, failure_count = process_records(persons, batch_size, max_workers)
+            total_updated = success_count
+            total_failed = failure_count
+            total_short_circuited = count_short_circuited(persons)
+            total_processed, circuit_open, next_token = _stopped_early_state(persons, start_key, next_token)
+            
+            _log_final_summary(total_processed, total_updated, total_failed, total_short_circuited)
+        else:
+            logger.info("No records to process")
+    
+    except Exception as e:
+        return _error_response(e, start_time, total_processed, total_updated, total_failed, next_token)
+    
+    return finish_run(event, context, start_time, total_processed, total_updated, total_failed, next_token,
+                      total_short_circuited, circuit_open)
+
+async def async_process_records(persons: List[Dict[str, Any]], client: Any, batch_size: int = 10,
+                                max_batches_in_flight: int = 20) -> tuple[int, int]:
+    """Process person records on the event loop.
+
+    Batches are prefetched concurrently, persons are processed as they become
+    ready and updates are written in chunks of WRITE_BATCH_SIZE, matching the
+    counts of process_records. Like process_records, it stops early when a
+    Wikimedia circuit opens and marks processed persons with PROCESSED_KEY;
+    batches that were already prefetched are still processed.
+
+    Args:
+        persons: List of person records to process
+        client: Open AsyncWikiClient
+        batch_size: Number of records prefetched together
+        max_batches_in_flight: Maximum number of batches being fetched at once
+
+    Returns:
+        Tuple of (success_count, failure_count)
+    """
+    total_success = 0
+    total_failure = 0
+    total_updates = 0
+    pending_updates = []
+    batches = [persons[i:i+batch_size] for i in range(0, len(persons), batch_size)]
+    batch_slots = asyncio.Semaphore(max_batches_in_flight)
+    write_lock = asyncio.Lock()
+    circuit_error = None
+    
+    logger.info(f"Processing {len(persons)} records in {len(batches)} batches on the event loop")
+    
+    async def flush_updates():
+        nonlocal total_success, total_failure, pending_updates
+        if not pending_updates:
+            return
+        chunk, pending_updates = pending_updates, []
+        success, failure = await async_batch_update_persons(chunk)
+        total_success += success
+        total_failure += failure
+        logger.info(
+            f"Progress - Written: {len(chunk)}, Updated: {success}, Failed: {failure}, "
+            f"Running Total - Updated: {total_success}, Failed: {total_failure}"
+        )
+    
+    def stop_early(error):
+        nonlocal circuit_error
+        if not circuit_error:
+            circuit_error = error
+            logger.warning("Stopping early: %s", error)
+    
+    async def process_person_safely(person, prefetched):
+        try:
+            updated_person = await async_process_person(
+                person, client, prefetched.get(person.get('WikiID')), resolve_wiki_id=False
+            )
+        except CircuitOpenError as e:
+            stop_early(e)
+            return None
+        except Exception as e:
+            logger.error("Error processing person %s: %s", person.get('Name', 'Unknown'), e)
+            updated_person = None
+        person[PROCESSED_KEY] = True
+        return updated_person
+    
+    async def process_batch(batch):
+        nonlocal total_updates
+        async with batch_slots:
+            if circuit_error:
+                return
+            try:
+                pending = _pending_wiki_id_lookups(batch)
+                if pending:
+                    resolved = await client.resolve_titles([person['WikiPage'] for person in pending])
+                    for person in pending:
+                        apply_title_resolution(person, resolved.get(person['WikiPage']))
+                wiki_ids = [person['WikiID'] for person in batch if person.get('WikiID')]
+                prefetched = {}
+                revisions = {}
+                candidates = revision_probe_candidates(batch) if REVISION_PROBE else {}
+                if candidates:
+                    revisions = await client.get_latest_revisions(list(candidates))
+                    prefetched = unchanged_entity_facts(candidates, revisions)
+                changed_ids = [wiki_id for wiki_id in wiki_ids if wiki_id not in prefetched]
+                if changed_ids:
+                    prefetched.update(await client.get_entities_facts(changed_ids, min_revisions=revisions))
+            except CircuitOpenError as e:
+                stop_early(e)
+                return
+            except Exception as e:
+                logger.error("Error prefetching batch: %s", e)
+                prefetched = {}
+            results = await asyncio.gather(*(process_person_safely(person, prefetched) for person in batch))
+        
+        async with write_lock:
+            for updated_person in results:
+                if updated_person:
+                    pending_updates.append(updated_person)
+                    total_updates += 1
+                    if len(pending_updates) >= WRITE_BATCH_SIZE:
+                        await flush_updates()
+    
+    await asyncio.gather(*(process_batch(batch) for batch in batches))
+    async with write_lock:
+        await flush_updates()
+    
+    if total_updates:
+        logger.info(f"All batches complete: {total_updates} total updates processed")
+    else:
+        logger.info("All batches complete: no updates needed")
+    
+    return total_success, total_failure
+
+async def async_lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """Async engine entry point, returning the same response as lambda_handler.
+
+    Args:
+        event: Lambda event data
+        context: Lambda context object
+
+    Returns:
+        Response dictionary with processing results
+    """
+    from utils.async_wiki import AsyncWikiClient
+    
+    start_time = datetime.now()
+    total_processed = 0
+    total_updated = 0
+    total_failed = 0
+    total_short_circuited = 0
+    circuit_open = False
+    next_token = None
+    
+    batch_size = int(os.environ.get('BATCH_SIZE', '10'))
+    logger.info(f"Using batch size of {batch_size}")
+    max_batches_in_flight = int(os.environ.get('ASYNC_MAX_BATCHES', '20'))
+    logger.info(f"Using up to {max_batches_in_flight} batches in flight")
+    
+    # Check if this is a continuation of a previous run
+    start_key = get_start_key(event)
+    
+    try:
+        max_items = int(os.environ.get('MAX_ITEMS_PER_RUN', '100'))
+        logger.info(f"Using maximum of {max_items} items per run")
+        
+        await asyncio.to_thread(sweep_unmarked_persons, start_key)
+        
+        persons, next_token = await async_get_persons_without_death_date(
+            max_items=max_items, start_key=start_key, force_recheck=is_force_recheck(event)
+        )
+        
+        if persons:
+            total_processed = len(persons)
+            logger.info(f"Retrieved {total_processed} records to process")
+            
+            async with AsyncWikiClient() as client:
+                total_updated, total_failed = await async_process_records(
+                    persons, client, batch_size, max_batches_in_flight
+                )
+            total_short_circuited = count_short_circuited(persons)
+            total_processed, circuit_open, next_token = _stopped_early_state(persons, start_key, next_token)
+            
+            _log_final_summary(total_processed, total_updated, total_failed, total_short_circuited)
+        else:
+            logger.info("No records to process")
+    
+    except Exception as e:
+        return _error_response(e, start_time, total_processed, total_updated, total_failed, next_token)
+    
+    # Self-invocation uses blocking boto3 calls, so keep it off the event loop
+    return await asyncio.to_thread(
+        finish_run, event, context, start_time, total_processed, total_updated, total_failed, next_token,
+        total_short_circuited, circuit_open
+    )
@@ -0,0 +1,353 @@
+"""
+Asyncio Wikipedia/Wikidata client for the async engine
+
+Shares request building, response parsing, the entity cache, the rate
+limiter and the concurrency controller with utils.wiki, so both engines
+behave the same and produce the same results.
+"""
+
+import asyncio
+import json
+import logging
+from typing import Optional, Awaitable, Callable, Dict, Any, List, Tuple
+from urllib.parse import urlparse
+
+import aiohttp
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+from utils.wiki import (
+    DEFAULT_HEADERS,
+    HTTP_POOL_SIZE,
+    HTTP_TIMEOUT,
+    WIKIDATA_API_URL,
+    WIKIPEDIA_API_URL,
+    BASE_DELAY,
+    THROTTLE_STATUS_CODES,
+    ENTITY_PROPS,
+    MAX_IDS_PER_REQUEST,
+    EntityStreamPruner,
+    CircuitOpenError,
+    add_maxlag,
+    retry_delay,
+    handle_response,
+    handle_attempt_error,
+    handle_retries_exhausted,
+    get_rate_limiter,
+    get_concurrency_controller,
+    get_circuit_breaker,
+    get_async_single_flight,
+    parse_redirect_response,
+    parse_titles_response,
+    parse_entities_response,
+    parse_revisions_response,
+    split_cached_facts,
+    split_cached_titles,
+    cache_titles,
+    titles_query_params,
+    entities_params,
+    revisions_params
+)
+
+# Configure logging
+logger = logging.getLogger()
+
+def entities_stream_parser(props: Tuple[str, ...] = ENTITY_PROPS) -> Optional[Callable[[aiohttp.ClientResponse], Awaitable[Any]]]:
+    """Build a fetch_json parser that prunes wbgetentities responses while streaming.
+
+    Returns:
+        The parser, or None when ijson is not installed
+    """
+    if ijson is None:
+        return None
+
+    async def parse(response: aiohttp.ClientResponse) -> Dict[str, Any]:
+        pruner = EntityStreamPruner(props)
+        try:
+            async for prefix, event, value in ijson.parse_async(response.content, use_float=True):
+                pruner.feed(prefix, event, value)
+        except ijson.JSONError as e:
+            raise ValueError(f"Invalid JSON in entity response: {e}") from e
+        return pruner.result
+
+    return parse
+
+class AsyncWikiClient:
+    """Async client for the Wikipedia and Wikidata APIs.
+
+    Use as an async context manager so the underlying aiohttp session and
+    its keep-alive connections are closed when the run finishes:
+
+        async with AsyncWikiClient() as client:
+            facts = await client.get_entities_facts(["Q42"])
+    """
+
+    def __init__(self, pool_size: int = HTTP_POOL_SIZE):
+        self.pool_size = pool_size
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._slot_cond: Optional[asyncio.Condition] = None
+
+    async def __aenter__(self) -> "AsyncWikiClient":
+        connector = aiohttp.TCPConnector(limit_per_host=self.pool_size)
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            headers=DEFAULT_HEADERS,
+            timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT)
+        )
+        self._slot_cond = asyncio.Condition()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the HTTP session."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _acquire_slot(self) -> None:
+        """Wait for a free in-flight slot from the shared concurrency controller."""
+        controller = get_concurrency_controller()
+        async with self._slot_cond:
+            while not controller.try_acquire():
+                await self._slot_cond.wait()
+
+    async def _release_slot(self) -> None:
+        """Give back an in-flight slot and wake up waiting requests."""
+        get_concurrency_controller().release()
+        async with self._slot_cond:
+            self._slot_cond.notify_all()
+
+    async def fetch_json(self, url: str, api_name: str, params: Dict[str, Any], retries: int = 5,
+                         base_delay: float = BASE_DELAY,
+                         parser: Optional[Callable[[aiohttp.ClientResponse], Awaitable[Any]]] = None) -> Optional[Dict[str, Any]]:
+        """Fetch a MediaWiki API endpoint with exponential backoff retries on failure.
+
+        Args:
+            url: API endpoint URL
+            api_name: Human readable API name used in log messages
+            params: Request parameters for the API
+            retries: Number of retries before giving up
+            base_delay: Base delay in seconds for exponential backoff
+            parser: Reads the JSON from the response stream instead of ``response.json()``
+
+        Returns:
+            JSON response from the API, or None if all retries fail
+
+        Raises:
+            CircuitOpenError: The circuit of the host is open, so nothing was sent
+        """
+        host = urlparse(url).hostname
+        controller = get_concurrency_controller()
+        breaker = get_circuit_breaker()
+        logger.info(f"Making {api_name} API request to {url}")
+        logger.info(f"Parameters: {json.dumps(params, indent=2)}")
+
+        retry_after = None
+        host_failed = False  # Whether the last attempt failed because of the host
+        for attempt in range(retries):
+            # Don't sleep for a retry that the breaker would reject anyway
+            breaker.check(host)
+            try:
+                # Back off before retries; throttled attempts wait on the global Retry-After instead
+                if attempt > 0 and retry_after is None:
+                    actual_delay = retry_delay(attempt, base_delay)
+                    logger.info(f"Waiting {actual_delay:.2f} seconds before retry (attempt {attempt + 1}/{retries})...")
+                    await asyncio.sleep(actual_delay)
+                retry_after = None
+
+                blocked = controller.blocked_for()
+                if blocked > 0:
+                    logger.info(f"Waiting {blocked:.2f} seconds for Wikimedia Retry-After to expire")
+                    await asyncio.sleep(blocked)
+
+                breaker.before_request(host)
+                wait = get_rate_limiter().reserve(host)
+                if wait > 0:
+                    await asyncio.sleep(wait)
+
+                await self._acquire_slot()
+                try:
+                    async with self._session.get(url, params=params) as response:
+                        status = response.status
+                        headers = response.headers
+                        if status in THROTTLE_STATUS_CODES:
+                            data = None
+                        else:
+                            response.raise_for_status()
+                            data = await parser(response) if parser else await response.json(content_type=None)
+                finally:
+                    await self._release_slot()
+
+                done, retry_after, host_failed = handle_response(host, status, headers, data, attempt, base_delay)
+                if done:
+                    logger.info(f"{api_name} API request successful")
+                    return data
+
+            except aiohttp.ClientResponseError as e:
+                logger.error(f"Attempt {attempt + 1} failed: {str(e)}")
+                # 4xx answers mean a bad request, not an unhealthy host
+                host_failed = e.status >= 500
+                handle_attempt_error(host, host_failed)
+            except ValueError as e:
+                # Invalid JSON from a host that answered is a problem of this response only
+                logger.error(f"Attempt {attempt + 1} failed: {str(e)}")
+                host_failed = False
+                handle_attempt_error(host, host_failed)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.error(f"Attempt {attempt + 1} failed: {str(e)}")
+                host_failed = True
+                handle_attempt_error(host, host_failed)
+
+        handle_retries_exhausted(api_name, host, host_failed)
+        return None
+
+    async def fetch_wikidata(self, params: Dict[str, Any],
+                             parser: Optional[Callable[[aiohttp.ClientResponse], Awaitable[Any]]] = None) -> Optional[Dict[str, Any]]:
+        """Fetch Wikidata with retries, sending the configured maxlag."""
+        return await self.fetch_json(WIKIDATA_API_URL, "Wikidata", add_maxlag(params), parser=parser)
+
+    async def fetch_wikipedia(self, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Fetch the English Wikipedia API with retries."""
+        return await self.fetch_json(WIKIPEDIA_API_URL, "Wikipedia", params)
+
+    async def resolve_redirect(self, title: str) -> Optional[str]:
+        """Resolve Wikipedia page redirects.
+
+        Args:
+            title: Page URL title (end of URL)
+
+        Returns:
+            Fully resolved title or None if not found
+        """
+        try:
+            logger.info(f"Resolving Wikipedia page: {title}")
+            params = {
+                "action": "query",
+                "titles": title,
+                "redirects": 1,
+                "format": "json"
+            }
+            return parse_redirect_response(title, await self.fetch_wikipedia(params))
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            logger.error(f"Error resolving redirect for {title}: {str(e)}")
+            return None
+
+    async def resolve_titles(self, page_titles: List[str]) -> Dict[str, Dict[str, Optional[str]]]:
+        """Resolve page titles to final titles and QIDs, all chunks in parallel.
+
+        Args:
+            page_titles: Page URL titles (end of URL), duplicates allowed
+
+        Returns:
+            Dict mapping each input title that got an API answer to
+            ``{"title": resolved title or None, "wiki_id": QID or None, "failure": LOOKUP_* reason or None}``
+        """
+        # Cache tiers may do blocking I/O (SQLite, DynamoDB), so keep them off the event loop
+        results, titles = await asyncio.to_thread(split_cached_titles, page_titles)
+
+        async def resolve_chunk(chunk: List[str]) -> Dict[str, Dict[str, Optional[str]]]:
+            try:
+                logger.info(f"Resolving {len(chunk)} Wikipedia pages")
+                chunk_results = parse_titles_response(chunk, await self.fetch_wikipedia(titles_query_params(chunk)))
+                await asyncio.to_thread(cache_titles, chunk_results)
+                return chunk_results
+            except CircuitOpenError:
+                raise
+            except Exception as e:
+                logger.error(f"Error resolving pages {', '.join(chunk)}: {str(e)}")
+                return {}
+
+        async def fetch_titles(titles: List[str]) -> Dict[str, Dict[str, Optional[str]]]:
+            chunks = [titles[i:i + MAX_IDS_PER_REQUEST] for i in range(0, len(titles), MAX_IDS_PER_REQUEST)]
+            fetched = {}
+            for chunk_results in await asyncio.gather(*(resolve_chunk(chunk) for chunk in chunks)):
+                fetched.update(chunk_results)
+            return fetched
+
+        # Titles another coroutine is already resolving are awaited instead of requested again
+        results.update(await get_async_single_flight("titles").do_many(titles, fetch_titles))
+        return results
+
+    async def get_wiki_id_from_page(self, page_title: str) -> Optional[str]:
+        """Get Wikidata ID from Wikipedia page title."""
+        if not page_title:
+            return None
+        logger.info(f"Looking up WikiID for page: {page_title}")
+        return (await self.resolve_titles([page_title])).get(page_title, {}).get("wiki_id")
+
+    async def get_latest_revisions(self, wikidata_q_numbers: List[str]) -> Dict[str, int]:
+        """Get the current revision ID of many Wikidata entities, all chunks in parallel.
+
+        Args:
+            wikidata_q_numbers: Wiki Data IDs (Q Numbers), duplicates allowed
+
+        Returns:
+            Dict mapping each QID that could be checked to its latest revision ID
+        """
+        q_numbers = list(dict.fromkeys(q for q in wikidata_q_numbers if q))
+        chunks = [q_numbers[i:i + MAX_IDS_PER_REQUEST] for i in range(0, len(q_numbers), MAX_IDS_PER_REQUEST)]
+
+        async def check_chunk(chunk: List[str]) -> Dict[str, int]:
+            try:
+                logger.info(f"Checking revisions of {len(chunk)} entities")
+                return parse_revisions_response(chunk, await self.fetch_wikidata(revisions_params(chunk)))
+            except CircuitOpenError:
+                raise
+            except Exception as e:
+                logger.error(f"Error checking revisions of {', '.join(chunk)}: {str(e)}")
+                return {}
+
+        revisions = {}
+        for chunk_revisions in await asyncio.gather(*(check_chunk(chunk) for chunk in chunks)):
+            revisions.update(chunk_revisions)
+        return revisions
+
+    async def get_entities_facts(self, wikidata_q_numbers: List[str], props: Tuple[str, ...] = ENTITY_PROPS,
+                                 min_revisions: Optional[Dict[str, int]] = None) -> Dict[str, Dict[str, Any]]:
+        """Fetch many Wikidata entities, all uncached chunks in parallel.
+
+        Args:
+            wikidata_q_numbers: Wiki Data IDs (Q Numbers), duplicates allowed
+            props: Property IDs to extract
+            min_revisions: Oldest acceptable revision per QID; older cached facts are refetched
+
+        Returns:
+            Dict mapping each QID that could be fetched to its entity facts
+        """
+        results, missing = await asyncio.to_thread(split_cached_facts, wikidata_q_numbers, props, min_revisions)
+
+        async def fetch_chunk(chunk: List[str]) -> Dict[str, Dict[str, Any]]:
+            try:
+                logger.info(f"Getting {', '.join(props)} for {len(chunk)} entities")
+                data = await self.fetch_wikidata(entities_params(chunk), parser=entities_stream_parser(props))
+                return await asyncio.to_thread(parse_entities_response, chunk, data, props)
+            except CircuitOpenError:
+                raise
+            except Exception as e:
+                logger.error(f"Error getting entities {', '.join(chunk)}: {str(e)}")
+                return {}
+
+        async def fetch_entities(q_numbers: List[str]) -> Dict[str, Dict[str, Any]]:
+            chunks = [q_numbers[i:i + MAX_IDS_PER_REQUEST] for i in range(0, len(q_numbers), MAX_IDS_PER_REQUEST)]
+            fetched = {}
+            for chunk_results in await asyncio.gather(*(fetch_chunk(chunk) for chunk in chunks)):
+                fetched.update(chunk_results)
+            return fetched
+
+        # QIDs another coroutine is already fetching with the same props are awaited instead of requested again
+        results.update(await get_async_single_flight("entities").do_many(missing, fetch_entities, scope=props))
+        return results
+
+    async def get_entity_facts(self, wikidata_q_number: str,
+                               props: Tuple[str, ...] = ENTITY_PROPS) -> Optional[Dict[str, Any]]:
+        """Fetch a single Wikidata entity and extract the requested properties."""
+        if not wikidata_q_number:
+            return None
+        return (await self.get_entities_facts([wikidata_q_number], props)).get(wikidata_q_number)
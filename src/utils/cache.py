@@ -0,0 +1,435 @@
+"""
+Tiered key/value cache for Wikipedia/Wikidata lookups
+
+A fast in-process LRU sits in front of slower, longer-lived tiers: an SQLite
+file under /tmp, which survives warm Lambda invocations and local runs, and a
+DynamoDB table shared by every invocation.
+Values must be JSON-serializable; every entry expires after its TTL, and
+tiers keep the absolute expiry so promoted entries do not outlive it.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+import boto3
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from botocore.exceptions import ClientError
+from typing import Optional, Dict, Any, Iterable, List, Tuple
+
+# Configure logging
+logger = logging.getLogger()
+
+class CacheTier(ABC):
+    """Interface shared by all cache tiers."""
+
+    name = "tier"
+
+    def __init__(self):
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0}
+        self._counters_lock = threading.Lock()
+
+    def _count(self, counter: str, amount: int = 1) -> None:
+        if amount:
+            with self._counters_lock:
+                self._counters[counter] += amount
+
+    @abstractmethod
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Tuple[Any, float]]:
+        """Get the unexpired entries of keys present in this tier as (value, expires_at) pairs."""
+
+    @abstractmethod
+    def set_many(self, entries: Dict[str, Tuple[Any, float]]) -> None:
+        """Store (value, expires_at) pairs, expires_at being an epoch timestamp."""
+
+    @abstractmethod
+    def delete(self, keys: Iterable[str]) -> None:
+        """Drop the entries of keys, if present."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Drop every entry."""
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit, miss and eviction counters."""
+        with self._counters_lock:
+            return dict(self._counters)
+
+class MemoryTier(CacheTier):
+    """Size-bounded in-process LRU with per-entry expiry."""
+
+    name = "memory"
+
+    def __init__(self, max_size: int = 1024):
+        super().__init__()
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Tuple[Any, float]]:
+        keys = list(dict.fromkeys(keys))
+        now = time.time()
+        found = {}
+        expired = 0
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+                if entry[0] <= now:
+                    del self._entries[key]
+                    expired += 1
+                    continue
+                self._entries.move_to_end(key)
+                found[key] = (entry[1], entry[0])
+        self._count("hits", len(found))
+        self._count("misses", len(keys) - len(found))
+        self._count("evictions", expired)
+        return found
+
+    def set_many(self, entries: Dict[str, Tuple[Any, float]]) -> None:
+        evicted = 0
+        with self._lock:
+            for key, (value, expires_at) in entries.items():
+                self._entries[key] = (expires_at, value)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                evicted += 1
+        self._count("evictions", evicted)
+
+    def delete(self, keys: Iterable[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        with self._lock:
+            stats["size"] = len(self._entries)
+        return stats
+
+class SQLiteTier(CacheTier):
+    """Cache tier in an SQLite file, shared by every invocation of a warm container.
+
+    Values are stored as compact JSON. Expired rows are treated as misses and
+    purged when the file is opened and on every PURGE_INTERVAL writes.
+    """
+
+    name = "sqlite"
+    PURGE_INTERVAL = 500
+    MAX_VARIABLES = 500  # Stay well below SQLite's bound parameter limit
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+        self._lock = threading.Lock()
+        self._writes = 0
+        # One connection guarded by a lock; worker threads share it
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+        self._purge_expired()
+
+    def _purge_expired(self) -> None:
+        with self._lock, self._conn:
+            purged = self._conn.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),)).rowcount
+        self._count("evictions", max(purged, 0))
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Tuple[Any, float]]:
+        keys = list(dict.fromkeys(keys))
+        now = time.time()
+        found = {}
+        with self._lock:
+            for i in range(0, len(keys), self.MAX_VARIABLES):
+                chunk = keys[i:i + self.MAX_VARIABLES]
+                rows = self._conn.execute(
+                    f"SELECT key, value, expires_at FROM cache WHERE expires_at > ? AND key IN ({','.join('?' * len(chunk))})",
+                    [now, *chunk]
+                ).fetchall()
+                for key, value, expires_at in rows:
+                    found[key] = (json.loads(value), expires_at)
+        self._count("hits", len(found))
+        self._count("misses", len(keys) - len(found))
+        return found
+
+    def set_many(self, entries: Dict[str, Tuple[Any, float]]) -> None:
+        rows = [
+            (key, json.dumps(value, separators=(",", ":")), expires_at)
+            for key, (value, expires_at) in entries.items()
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)", rows)
+            self._writes += len(rows)
+            purge = self._writes >= self.PURGE_INTERVAL
+            if purge:
+                self._writes = 0
+        if purge:
+            self._purge_expired()
+
+    def delete(self, keys: Iterable[str]) -> None:
+        keys = list(dict.fromkeys(keys))
+        with self._lock, self._conn:
+            for i in range(0, len(keys), self.MAX_VARIABLES):
+                chunk = keys[i:i + self.MAX_VARIABLES]
+                self._conn.execute(f"DELETE FROM cache WHERE key IN ({','.join('?' * len(chunk))})", chunk)
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM cache")
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        with self._lock:
+            stats["size"] = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        return stats
+
+class DynamoDBTier(CacheTier):
+    """Cache tier in a DynamoDB table shared by all Lambda invocations.
+
+    Items hold the key, the value as compact JSON and an ``ExpiresAt`` epoch
+    used as the table's TTL attribute. DynamoDB deletes expired items lazily,
+    so reads also skip items past their expiry.
+    """
+
+    name = "dynamodb"
+    KEY_ATTRIBUTE = "CacheKey"
+    VALUE_ATTRIBUTE = "Value"
+    TTL_ATTRIBUTE = "ExpiresAt"
+    MAX_KEYS_PER_BATCH = 100  # BatchGetItem limit
+    MAX_BATCH_ATTEMPTS = 3
+
+    def __init__(self, table_name: str, resource=None, endpoint_url: Optional[str] = None):
+        """
+        Args:
+            table_name: Name of the cache table
+            resource: boto3 DynamoDB resource to use, e.g. one for DynamoDB Local;
+                by default every thread creates its own
+            endpoint_url: Endpoint for the default resources, e.g. http://localhost:8000
+        """
+        super().__init__()
+        self.table_name = table_name
+        self.endpoint_url = endpoint_url
+        self._resource = resource
+        self._thread_local = threading.local()
+
+    def _get_resource(self):
+        # boto3 resources are not thread-safe, so each worker thread gets its own
+        if self._resource is not None:
+            return self._resource
+        resource = getattr(self._thread_local, "resource", None)
+        if resource is None:
+            resource = boto3.session.Session().resource("dynamodb", endpoint_url=self.endpoint_url)
+            self._thread_local.resource = resource
+        return resource
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Tuple[Any, float]]:
+        keys = list(dict.fromkeys(keys))
+        now = time.time()
+        found = {}
+        resource = self._get_resource()
+        for i in range(0, len(keys), self.MAX_KEYS_PER_BATCH):
+            request = {self.table_name: {"Keys": [{self.KEY_ATTRIBUTE: key} for key in keys[i:i + self.MAX_KEYS_PER_BATCH]]}}
+            for attempt in range(self.MAX_BATCH_ATTEMPTS):
+                response = resource.batch_get_item(RequestItems=request)
+                for item in response.get("Responses", {}).get(self.table_name, []):
+                    expires_at = float(item.get(self.TTL_ATTRIBUTE, 0))
+                    if expires_at > now:
+                        found[item[self.KEY_ATTRIBUTE]] = (json.loads(item[self.VALUE_ATTRIBUTE]), expires_at)
+                request = response.get("UnprocessedKeys") or {}
+                if not request:
+                    break
+                time.sleep(0.05 * (2 ** attempt))
+        self._count("hits", len(found))
+        self._count("misses", len(keys) - len(found))
+        return found
+
+    def set_many(self, entries: Dict[str, Tuple[Any, float]]) -> None:
+        table = self._get_resource().Table(self.table_name)
+        # The batch writer resubmits unprocessed items on its own
+        with table.batch_writer(overwrite_by_pkeys=[self.KEY_ATTRIBUTE]) as batch:
+            for key, (value, expires_at) in entries.items():
+                batch.put_item(Item={
+                    self.KEY_ATTRIBUTE: key,
+                    self.VALUE_ATTRIBUTE: json.dumps(value, separators=(",", ":")),
+                    self.TTL_ATTRIBUTE: int(expires_at)
+                })
+
+    def delete(self, keys: Iterable[str]) -> None:
+        table = self._get_resource().Table(self.table_name)
+        with table.batch_writer(overwrite_by_pkeys=[self.KEY_ATTRIBUTE]) as batch:
+            for key in dict.fromkeys(keys):
+                batch.delete_item(Key={self.KEY_ATTRIBUTE: key})
+
+    def clear(self) -> None:
+        table = self._get_resource().Table(self.table_name)
+        scan_params = {"ProjectionExpression": self.KEY_ATTRIBUTE}
+        with table.batch_writer() as batch:
+            while True:
+                response = table.scan(**scan_params)
+                for item in response.get("Items", []):
+                    batch.delete_item(Key={self.KEY_ATTRIBUTE: item[self.KEY_ATTRIBUTE]})
+                if not response.get("LastEvaluatedKey"):
+                    break
+                scan_params["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+def create_dynamodb_cache_table(table_name: str, resource=None, endpoint_url: Optional[str] = None):
+    """Create a cache table with TTL enabled, e.g. in DynamoDB Local for tests.
+
+    Deployed stacks get the table from template.yaml instead.
+
+    Returns:
+        The created Table
+    """
+    resource = resource or boto3.resource("dynamodb", endpoint_url=endpoint_url)
+    table = resource.create_table(
+        TableName=table_name,
+        KeySchema=[{"AttributeName": DynamoDBTier.KEY_ATTRIBUTE, "KeyType": "HASH"}],
+        AttributeDefinitions=[{"AttributeName": DynamoDBTier.KEY_ATTRIBUTE, "AttributeType": "S"}],
+        BillingMode="PAY_PER_REQUEST"
+    )
+    table.wait_until_exists()
+    try:
+        resource.meta.client.update_time_to_live(
+            TableName=table_name,
+            TimeToLiveSpecification={"Enabled": True, "AttributeName": DynamoDBTier.TTL_ATTRIBUTE}
+        )
+    except ClientError as e:
+        # Some local stand-ins do not implement TTL; reads still skip expired items
+        logger.warning(f"Could not enable TTL on {table_name}: {e}")
+    return table
+
+class TieredCache:
+    """Look keys up tier by tier, fastest first.
+
+    Hits from a slower tier are copied into the faster tiers in front of it
+    with their original expiry, and writes go to every tier.
+    """
+
+    def __init__(self, tiers: List[CacheTier], default_ttl: float = 3600):
+        self.tiers = tiers
+        self.default_ttl = default_ttl
+        self._counters = {"hits": 0, "misses": 0}
+        self._counters_lock = threading.Lock()
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Get the cached values of keys from the fastest tier holding them.
+
+        Args:
+            keys: Cache keys, duplicates allowed
+
+        Returns:
+            Dict of the keys that were found to their values
+        """
+        missing = list(dict.fromkeys(keys))
+        requested = len(missing)
+        found = {}
+        for index, tier in enumerate(self.tiers):
+            if not missing:
+                break
+            try:
+                tier_found = tier.get_many(missing)
+            except Exception as e:
+                logger.warning(f"Could not read from {tier.name} cache tier: {e}")
+                continue
+            if not tier_found:
+                continue
+            found.update((key, value) for key, (value, _) in tier_found.items())
+            missing = [key for key in missing if key not in tier_found]
+            # Promote to faster tiers, keeping the expiry so entries do not outlive their TTL
+            for faster in self.tiers[:index]:
+                try:
+                    faster.set_many(tier_found)
+                except Exception as e:
+                    logger.warning(f"Could not promote to {faster.name} cache tier: {e}")
+        with self._counters_lock:
+            self._counters["hits"] += len(found)
+            self._counters["misses"] += requested - len(found)
+        return found
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a single cached value, or None."""
+        return self.get_many([key]).get(key)
+
+    def set_many(self, items: Dict[str, Any], ttl: Optional[float] = None) -> None:
+        """Store values in every tier.
+
+        Args:
+            items: Keys and JSON-serializable values
+            ttl: Seconds until the values expire (defaults to default_ttl)
+        """
+        if not items:
+            return
+        expires_at = time.time() + (ttl or self.default_ttl)
+        entries = {key: (value, expires_at) for key, value in items.items()}
+        for tier in self.tiers:
+            try:
+                tier.set_many(entries)
+            except Exception as e:
+                logger.warning(f"Could not write to {tier.name} cache tier: {e}")
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a single value in every tier."""
+        self.set_many({key: value}, ttl)
+
+    def delete_many(self, keys: Iterable[str]) -> None:
+        """Drop keys from every tier."""
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return
+        for tier in self.tiers:
+            try:
+                tier.delete(keys)
+            except Exception as e:
+                logger.warning(f"Could not delete from {tier.name} cache tier: {e}")
+
+    def delete(self, key: str) -> None:
+        """Drop a single key from every tier."""
+        self.delete_many([key])
+
+    def clear(self) -> None:
+        """Drop every entry of every tier."""
+        for tier in self.tiers:
+            tier.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get overall hit/miss counters and the counters of each tier."""
+        with self._counters_lock:
+            stats = dict(self._counters)
+        stats["tiers"] = {tier.name: tier.stats() for tier in self.tiers}
+        return stats
+
+def create_tiered_cache(memory_size: int, sqlite_path: Optional[str] = None, default_ttl: float = 3600,
+                        dynamodb_table: Optional[str] = None, dynamodb_endpoint_url: Optional[str] = None) -> TieredCache:
+    """Build a memory tier, plus SQLite and DynamoDB tiers when configured.
+
+    Args:
+        memory_size: Maximum number of entries kept in memory
+        sqlite_path: SQLite file for the persistent tier, None or empty to disable
+        default_ttl: Seconds until entries expire unless set with another TTL
+        dynamodb_table: Shared DynamoDB cache table, None or empty to disable
+        dynamodb_endpoint_url: Endpoint of the DynamoDB cache table, e.g. DynamoDB Local
+
+    Returns:
+        The tiered cache
+    """
+    tiers: List[CacheTier] = [MemoryTier(memory_size)]
+    if sqlite_path:
+        try:
+            os.makedirs(os.path.dirname(sqlite_path) or ".", exist_ok=True)
+            tiers.append(SQLiteTier(sqlite_path))
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"SQLite cache at {sqlite_path} unavailable, skipping it: {e}")
+    if dynamodb_table:
+        tiers.append(DynamoDBTier(dynamodb_table, endpoint_url=dynamodb_endpoint_url))
+    return TieredCache(tiers, default_ttl)
@@ -1,10 +1,16 @@
 """
 DynamoDB utilities for person record management
 """
+import asyncio
 import json
 import os
 import logging
+import random
+import threading
+import time
 import boto3
+from concurrent.futures import ThreadPoolExecutor
+from botocore.exceptions import BotoCoreError, ClientError
 from datetime import datetime
 from typing import Dict, Any, List
 
@@ -12,9 +18,87 @@ from typing import Dict, Any, List
 dynamodb = boto3.resource('dynamodb')
 table = dynamodb.Table(os.environ['TABLE_NAME'])
 
+# GSI keyed on SK (hash) and PK (range), see dynamodb_update.yaml
+PERSON_INDEX_NAME = os.environ.get('PERSON_INDEX_NAME', 'SK-PK-index')
+
+# Sparse GSI over persons without a DeathDate (set ALIVE_INDEX_NAME to '' to disable)
+ALIVE_INDEX_NAME = os.environ.get('ALIVE_INDEX_NAME', 'Alive-PK-index')
+ALIVE_ATTRIBUTE = 'Alive'
+ALIVE_VALUE = 'Y'
+
+# Persons created without Alive are invisible to the alive index until marked. The sweep
+# reads every person, so it is off for nightly runs; run scripts/backfill_alive_index.py --unmarked-only
+ALIVE_INDEX_SWEEP = os.environ.get('ALIVE_INDEX_SWEEP', 'false').lower() == 'true'
+
+# Sparse GSI over living persons keyed on the MM-DD of their BirthDate, used by the age roll
+BIRTHDAY_INDEX_NAME = os.environ.get('BIRTHDAY_INDEX_NAME', 'BirthMonthDay-PK-index')
+BIRTH_MONTH_DAY_ATTRIBUTE = 'BirthMonthDay'
+
+# How changed persons are written: 'update' sends UpdateItem with only the
+# changed attributes, 'put' writes whole items with batch PutRequests
+WRITE_MODE_UPDATE = 'update'
+WRITE_MODE_PUT = 'put'
+WRITE_MODE = os.environ.get('WRITE_MODE', WRITE_MODE_UPDATE).lower()
+WRITE_WORKERS = int(os.environ.get('WRITE_WORKERS', '4'))
+
+# Retry budget for UnprocessedItems and throttled batch writes
+BATCH_WRITE_MAX_RETRIES = int(os.environ.get('BATCH_WRITE_MAX_RETRIES', '8'))
+BATCH_WRITE_MAX_SECONDS = float(os.environ.get('BATCH_WRITE_MAX_SECONDS', '30'))
+BATCH_WRITE_BASE_DELAY = 0.05
+BATCH_WRITE_MAX_DELAY = 5.0
+RETRYABLE_WRITE_ERROR_CODES = (
+    'ProvisionedThroughputExceededException',
+    'ThrottlingException',
+    'RequestLimitExceeded',
+    'InternalServerError',
+    'ServiceUnavailable'
+)
+
+# Per-item write outcomes
+WRITE_UPDATED = 'updated'
+WRITE_UNCHANGED = 'unchanged'
+WRITE_SKIPPED = 'skipped'  # The person was deleted since it was read
+WRITE_FAILED = 'failed'
+
+# Negative cache of failed WikiID lookups: the reason, how often it failed in a
+# row and the YYYY-MM-DD date before which the person is not read again.
+# FORCE_RECHECK=true (or a forceRecheck event) reads them regardless.
+LOOKUP_FAILURE_ATTRIBUTE = 'WikiLookupFailure'
+LOOKUP_FAILURE_COUNT_ATTRIBUTE = 'WikiFailureCount'
+LOOKUP_RETRY_AT_ATTRIBUTE = 'WikiRetryAt'
+FORCE_RECHECK = os.environ.get('FORCE_RECHECK', 'false').lower() == 'true'
+
+# Attributes the pipeline reads; everything else stays on the item untouched.
+# Set PERSON_PROJECTION to '' to read whole items. Puts need whole items, so
+# the projection is ignored in 'put' write mode.
+DEFAULT_PERSON_PROJECTION = (
+    'PK,SK,Name,WikiPage,WikiID,BirthDate,DeathDate,Age,Alive,BirthMonthDay,WikiDigest,WikiRevId,'
+    'WikiLookupFailure,WikiFailureCount,WikiRetryAt'
+)
+PERSON_PROJECTION = [] if WRITE_MODE == WRITE_MODE_PUT else [
+    name.strip() for name in os.environ.get('PERSON_PROJECTION', DEFAULT_PERSON_PROJECTION).split(',')
+    if name.strip()
+]
+
+# Private key on person dicts listing the attributes changed since they were read.
+# Keys starting with an underscore are pipeline state and never written.
+CHANGED_ATTRIBUTES_KEY = '_changed'
+
 # Configure logging
 logger = logging.getLogger()
 
+# Composite cursor for parallel scans: one resume key (or SEGMENT_DONE) per segment
+PARALLEL_SCAN_CURSOR_KEY = 'parallelScan'
+SEGMENT_DONE = 'done'
+
+# Per-thread boto3 resources for worker pools
+_thread_local = threading.local()
+
+# Long-lived worker pools keyed by (purpose, size); their threads keep their
+# boto3 resources across calls and warm invocations
+_worker_pools = {}
+_worker_pools_lock = threading.Lock()
+
 class DateTimeEncoder(json.JSONEncoder):
     """Custom JSON encoder for datetime objects."""
     def default(self, obj):
@@ -26,12 +110,215 @@ def format_date(dt: datetime) -> str:
     """Format datetime to YYYY-MM-DD string."""
     return dt.strftime('%Y-%m-%d')
 
-def get_persons_without_death_date(max_items: int = None, start_key: Dict[str, Any] = None) -> tuple[List[Dict[str, Any]], str]:
+def birth_month_day(birth_date: Any) -> str:
+    """Get the MM-DD birthday key of a datetime or YYYY-MM-DD birth date, or None."""
+    if isinstance(birth_date, datetime):
+        return birth_date.strftime('%m-%d')
+    if isinstance(birth_date, str) and len(birth_date.split('-')) >= 3:
+        month, day = birth_date.split('-')[-2:]
+        return f"{month}-{day[:2]}"
+    return None
+
+def _is_conditional_check_failed(error: Exception) -> bool:
+    """Check whether a DynamoDB error is a failed ConditionExpression."""
+    return isinstance(error, ClientError) and \
+        error.response.get('Error', {}).get('Code') == 'ConditionalCheckFailedException'
+
+def _is_missing_index_error(error: Exception) -> bool:
+    """Check whether a DynamoDB error means the queried index does not exist."""
+    if not isinstance(error, ClientError):
+        return False
+    code = error.response.get('Error', {}).get('Code')
+    message = error.response.get('Error', {}).get('Message', '')
+    return code == 'ResourceNotFoundException' or (code == 'ValidationException' and 'index' in message.lower())
+
+def projection_params(attributes: List[str] = None) -> Dict[str, Any]:
+    """Build ProjectionExpression parameters for person reads.
+
+    Attribute names are aliased because several of them (Name, Age) are
+    DynamoDB reserved words.
+
+    Args:
+        attributes: Attribute names to read (defaults to PERSON_PROJECTION)
+
+    Returns:
+        Parameters to merge into a scan or query, empty to read whole items
+    """
+    attributes = PERSON_PROJECTION if attributes is None else attributes
+    if not attributes:
+        return {}
+    names = {f'#p{i}': name for i, name in enumerate(attributes)}
+    return {
+        'ProjectionExpression': ', '.join(names),
+        'ExpressionAttributeNames': names
+    }
+
+def skip_backed_off_params(params: Dict[str, Any], today: datetime = None) -> Dict[str, Any]:
+    """Extend read parameters to skip persons whose WikiID lookup is backed off.
+
+    Args:
+        params: Scan or query parameters with a FilterExpression
+        today: Date to compare WikiRetryAt with (defaults to now)
+
+    Returns:
+        New parameters that only match persons without a retry date in the future
+    """
+    today = format_date(today or datetime.now())
+    return dict(
+        params,
+        FilterExpression=(
+            f"({params['FilterExpression']}) AND "
+            f"(attribute_not_exists({LOOKUP_RETRY_AT_ATTRIBUTE}) OR {LOOKUP_RETRY_AT_ATTRIBUTE} <= :retry_today)"
+        ),
+        ExpressionAttributeValues=dict(params.get('ExpressionAttributeValues', {}), **{':retry_today': today})
+    )
+
+def mark_changed(person: Dict[str, Any], *attributes: str) -> None:
+    """Record that attributes of a person were changed and must be written."""
+    person.setdefault(CHANGED_ATTRIBUTES_KEY, set()).update(attributes)
+
+def get_changed_attributes(person: Dict[str, Any]) -> set:
+    """Get the attributes of a person marked as changed."""
+    return set(person.get(CHANGED_ATTRIBUTES_KEY, ()))
+
+def _read_pages(operation, params: Dict[str, Any], max_items: int = None, start_key: Dict[str, Any] = None,
+                batch_size: int = 100, label: str = 'Scanning') -> tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """Page through a scan or query until max_items have been read.
+
+    Args:
+        operation: Bound table.scan or table.query
+        params: Parameters for the operation, without Limit/ExclusiveStartKey
+        max_items: Maximum number of items to retrieve (None for all)
+        start_key: Exclusive start key for pagination (None for first page)
+        batch_size: Page size passed as Limit
+        label: Verb used in log messages
+
+    Returns:
+        Tuple of (items, key to resume after the last returned item or None when done)
+    """
+    items = []
+    last_evaluated_key = start_key
+    page_count = 0
+    
+    while True:
+        page_count += 1
+        logger.info(f"{label} page {page_count}")
+        
+        page_params = dict(params, Limit=batch_size)
+        
+        # Add ExclusiveStartKey for pagination if we have one
+        if last_evaluated_key:
+            page_params['ExclusiveStartKey'] = last_evaluated_key
+            logger.info(f"Using start key: {json.dumps(last_evaluated_key, default=str)}")
+        
+        response = operation(**page_params)
+        
+        # Get items from this page
+        page_items = response.get('Items', [])
+        last_evaluated_key = response.get('LastEvaluatedKey')
+        logger.info(f"Retrieved {len(page_items)} persons on page {page_count}")
+        
+        # Check if we've reached the maximum number of items
+        if max_items and len(items) + len(page_items) >= max_items:
+            logger.info(f"Reached maximum item limit of {max_items}")
+            keep = max_items - len(items)
+            items.extend(page_items[:keep])
+            if keep < len(page_items):
+                # Resume right after the last returned item so the rest of the page is not skipped
+                last_evaluated_key = {'PK': items[-1]['PK'], 'SK': items[-1]['SK']}
+            break
+        
+        items.extend(page_items)
+        
+        # Check if there are more pages
+        if not last_evaluated_key:
+            logger.info("No more pages to read")
+            break
+    
+    return items, last_evaluated_key
+
+def _person_read_strategies(start_key: Dict[str, Any] = None, force_recheck: bool = False) -> List[tuple]:
+    """Build the ways to read alive persons, cheapest first.
+
+    Each entry is (index name or None, operation, params, log label, start key).
+    Index-based reads fall through to the next entry when the index is missing.
+    Persons with a backed-off WikiID lookup are filtered out unless force_recheck.
+    """
+    strategies = []
+    
+    # Sparse index: only persons without a DeathDate carry the Alive attribute
+    if ALIVE_INDEX_NAME:
+        alive_start_key = dict(start_key, **{ALIVE_ATTRIBUTE: ALIVE_VALUE}) if isinstance(start_key, dict) else start_key
+        strategies.append((
+            ALIVE_INDEX_NAME,
+            table.query,
+            {
+                'IndexName': ALIVE_INDEX_NAME,
+                'KeyConditionExpression': f'{ALIVE_ATTRIBUTE} = :alive',
+                'FilterExpression': 'attribute_not_exists(DeathDate)',
+                'ExpressionAttributeValues': {':alive': ALIVE_VALUE},
+                **projection_params()
+            },
+            'Querying',
+            alive_start_key
+        ))
+    
+    # Get all records that:
+    # 1. Start with PERSON# in PK
+    # 2. Have SK = DETAILS
+    # 3. Don't have a DeathDate
+    expression_attr_values = {
+        ':pk_prefix': 'PERSON#',
+        ':sk': 'DETAILS'
+    }
+    strategies.append((
+        PERSON_INDEX_NAME,
+        table.query,
+        {
+            'IndexName': PERSON_INDEX_NAME,
+            'KeyConditionExpression': 'SK = :sk AND begins_with(PK, :pk_prefix)',
+            'FilterExpression': 'attribute_not_exists(DeathDate)',
+            'ExpressionAttributeValues': expression_attr_values,
+            **projection_params()
+        },
+        'Querying',
+        start_key
+    ))
+    strategies.append((
+        None,
+        table.scan,
+        {
+            'FilterExpression': (
+                'begins_with(PK, :pk_prefix) AND '
+                'SK = :sk AND '
+                'attribute_not_exists(DeathDate)'
+            ),
+            'ExpressionAttributeValues': expression_attr_values,
+            **projection_params()
+        },
+        'Scanning',
+        start_key
+    ))
+    if force_recheck:
+        return strategies
+    return [
+        (index_name, operation, skip_backed_off_params(params), label, read_start_key)
+        for index_name, operation, params, label, read_start_key in strategies
+    ]
+
+def get_persons_without_death_date(max_items: int = None, start_key: Dict[str, Any] = None,
+                                  force_recheck: bool = FORCE_RECHECK) -> tuple[List[Dict[str, Any]], str]:
     """Get persons without death dates from DynamoDB using pagination.
     
+    Queries the sparse alive-persons index so only candidates are read. When
+    it does not exist, queries the SK-PK-index GSI for PERSON# detail records,
+    and falls back to a filtered table scan when that index is missing too.
+    Persons whose WikiID lookup failed are skipped until their WikiRetryAt.
+    
     Args:
         max_items: Maximum number of items to retrieve (None for all)
         start_key: Exclusive start key for pagination (None for first page)
+        force_recheck: Also read persons whose WikiID lookup is backed off
         
     Returns:
         Tuple of (list of person records, pagination token as string)
@@ -41,66 +328,28 @@ def get_persons_without_death_date(max_items: int = None, start_key: Dict[str, A
         # Get batch size from environment variable or use default
         batch_size = int(os.environ.get('SCAN_BATCH_SIZE', '100'))
         logger.info(f"Using scan batch size of {batch_size}")
+        scan_segments = int(os.environ.get('SCAN_SEGMENTS', '1'))
         
-        # Get all records that:
-        # 1. Start with PERSON# in PK
-        # 2. Have SK = DETAILS
-        # 3. Don't have a DeathDate
-        filter_expression = (
-            'begins_with(PK, :pk_prefix) AND '
-            'SK = :sk AND '
-            'attribute_not_exists(DeathDate)'
-        )
-        expression_attr_values = {
-            ':pk_prefix': 'PERSON#',
-            ':sk': 'DETAILS'
-        }
-        
-        # Initialize variables for pagination
-        items = []
-        last_evaluated_key = start_key
-        page_count = 0
+        # A composite cursor means we are resuming a parallel scan
+        if is_parallel_scan_cursor(start_key):
+            return parallel_scan_persons(max_items=max_items, cursor=start_key, batch_size=batch_size,
+                                         force_recheck=force_recheck)
         
-        # Paginate through results
-        while True:
-            page_count += 1
-            logger.info(f"Scanning page {page_count}")
-            
-            # Prepare scan parameters
-            scan_params = {
-                'FilterExpression': filter_expression,
-                'ExpressionAttributeValues': expression_attr_values,
-                'Limit': batch_size
-            }
-            
-            # Add ExclusiveStartKey for pagination if we have one
-            if last_evaluated_key:
-                scan_params['ExclusiveStartKey'] = last_evaluated_key
-                logger.info(f"Using start key: {json.dumps(last_evaluated_key, default=str)}")
-            
-            # Execute the scan
-            response = table.scan(**scan_params)
-            
-            # Get items from this page
-            page_items = response.get('Items', [])
-            items.extend(page_items)
-            logger.info(f"Retrieved {len(page_items)} persons on page {page_count}")
-            
-            # Check if we've reached the maximum number of items
-            if max_items and len(items) >= max_items:
-                logger.info(f"Reached maximum item limit of {max_items}")
-                items = items[:max_items]  # Trim to max_items
-                break
-            
-            # Check if there are more pages
-            last_evaluated_key = response.get('LastEvaluatedKey')
-            if not last_evaluated_key:
-                logger.info("No more pages to scan")
-                break
-            
-            # If we have a max_items limit and we've reached it, stop pagination
-            if max_items and len(items) >= max_items:
+        for index_name, operation, params, label, read_start_key in _person_read_strategies(start_key, force_recheck):
+            if not index_name and scan_segments > 1:
+                return parallel_scan_persons(scan_segments, max_items=max_items, batch_size=batch_size,
+                                             force_recheck=force_recheck)
+            try:
+                if index_name:
+                    logger.info(f"Querying index {index_name}")
+                items, last_evaluated_key = _read_pages(
+                    operation, params, max_items, read_start_key, batch_size, label=label
+                )
                 break
+            except ClientError as e:
+                if not index_name or not _is_missing_index_error(e):
+                    raise
+                logger.warning(f"Index {index_name} not available ({e}), falling back")
         
         logger.info(f"Retrieved a total of {len(items)} persons to process")
         
@@ -108,23 +357,154 @@ def get_persons_without_death_date(max_items: int = None, start_key: Dict[str, A
         for i, item in enumerate(items[:5]):
             logger.info(f"Sample record {i+1}: {json.dumps(item, default=str)}")
         
-        # Convert the last_evaluated_key to a simple string token if it exists
-        pagination_token = None
-        if last_evaluated_key:
-            # Use the PK as the pagination token since it's unique
-            if 'PK' in last_evaluated_key:
-                pagination_token = last_evaluated_key['PK']
-                logger.info(f"Created pagination token from PK: {pagination_token}")
-            else:
-                # Fallback to using the whole key as JSON
-                pagination_token = json.dumps(last_evaluated_key, default=str)
-                logger.info(f"Created pagination token from full key: {pagination_token}")
-            
-        return items, pagination_token
+        return items, _key_to_token(last_evaluated_key)
     except Exception as e:
         logger.error(f"Error scanning table: {e}")
         return [], None
 
+def _key_to_token(last_evaluated_key: Dict[str, Any]) -> str:
+    """Convert a LastEvaluatedKey to a simple string pagination token."""
+    pagination_token = None
+    if last_evaluated_key:
+        # Use the PK as the pagination token since it's unique
+        if 'PK' in last_evaluated_key:
+            pagination_token = last_evaluated_key['PK']
+            logger.info(f"Created pagination token from PK: {pagination_token}")
+        else:
+            # Fallback to using the whole key as JSON
+            pagination_token = json.dumps(last_evaluated_key, default=str)
+            logger.info(f"Created pagination token from full key: {pagination_token}")
+    return pagination_token
+
+def _get_thread_table():
+    """Get a Table bound to a per-thread boto3 session.
+
+    boto3 resources are not thread-safe, so worker threads never share the
+    module-level table.
+    """
+    thread_table = getattr(_thread_local, 'table', None)
+    if thread_table is None:
+        thread_table = boto3.session.Session().resource('dynamodb').Table(os.environ['TABLE_NAME'])
+        _thread_local.table = thread_table
+    return thread_table
+
+def _get_worker_pool(purpose: str, max_workers: int) -> ThreadPoolExecutor:
+    """Get the shared worker pool for a purpose and size, creating it on first use.
+
+    Reusing the pool keeps its threads, and with them the per-thread tables
+    from _get_thread_table, so a boto3 session is built once per worker
+    rather than once per call.
+    """
+    key = (purpose, max_workers)
+    with _worker_pools_lock:
+        pool = _worker_pools.get(key)
+        if pool is None:
+            pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"dynamo-{purpose}")
+            _worker_pools[key] = pool
+    return pool
+
+def is_parallel_scan_cursor(start_key: Any) -> bool:
+    """Check whether a start key is a composite parallel scan cursor."""
+    return isinstance(start_key, dict) and PARALLEL_SCAN_CURSOR_KEY in start_key
+
+def parallel_scan_persons(total_segments: int = None, max_items: int = None, cursor: Dict[str, Any] = None,
+                          batch_size: int = 100, force_recheck: bool = FORCE_RECHECK) -> tuple[List[Dict[str, Any]], str]:
+    """Scan for persons without death dates using parallel scan segments.
+
+    Every segment is read on its own thread with Segment/TotalSegments and
+    gets an equal share of max_items. Results are merged in segment order,
+    and each segment keeps its own resume key in the returned cursor.
+
+    Args:
+        total_segments: Number of scan segments for a fresh scan
+        max_items: Maximum number of items to retrieve (None for all)
+        cursor: Composite cursor returned by a previous call, to resume
+        batch_size: Page size passed as Limit
+        force_recheck: Also read persons whose WikiID lookup is backed off
+
+    Returns:
+        Tuple of (list of person records, composite cursor as a JSON string or
+        None when every segment is finished)
+    """
+    if cursor:
+        state = cursor[PARALLEL_SCAN_CURSOR_KEY]
+        total_segments = state['totalSegments']
+        segment_keys = state['segments']
+    else:
+        segment_keys = [None] * total_segments
+    
+    # Split max_items across unfinished segments; segments without a share wait for the next call
+    pending = [i for i, key in enumerate(segment_keys) if key != SEGMENT_DONE]
+    quotas = {i: None for i in pending}
+    if max_items:
+        base, extra = divmod(max_items, len(pending) or 1)
+        quotas = {i: base + (1 if n < extra else 0) for n, i in enumerate(pending)}
+    active = [i for i in pending if quotas[i] != 0]
+    logger.info(f"Parallel scan of {len(active)}/{total_segments} segments for up to {max_items or 'all'} items")
+    
+    scan_params = {
+        'FilterExpression': (
+            'begins_with(PK, :pk_prefix) AND '
+            'SK = :sk AND '
+            'attribute_not_exists(DeathDate)'
+        ),
+        'ExpressionAttributeValues': {
+            ':pk_prefix': 'PERSON#',
+            ':sk': 'DETAILS'
+        },
+        'TotalSegments': total_segments,
+        **projection_params()
+    }
+    if not force_recheck:
+        scan_params = skip_backed_off_params(scan_params)
+    
+    def scan_segment(segment: int) -> tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        return _read_pages(
+            _get_thread_table().scan, dict(scan_params, Segment=segment), quotas[segment],
+            segment_keys[segment], batch_size, label=f"Scanning segment {segment}"
+        )
+    
+    items = []
+    next_keys = list(segment_keys)
+    if active:
+        executor = _get_worker_pool('scan', total_segments)
+        for segment, (segment_items, last_key) in zip(active, executor.map(scan_segment, active)):
+            items.extend(segment_items)
+            next_keys[segment] = last_key if last_key else SEGMENT_DONE
+    
+    logger.info(f"Retrieved a total of {len(items)} persons from parallel scan")
+    
+    if all(key == SEGMENT_DONE for key in next_keys):
+        return items, None
+    
+    cursor_token = json.dumps(
+        {PARALLEL_SCAN_CURSOR_KEY: {'totalSegments': total_segments, 'segments': next_keys}},
+        default=str
+    )
+    logger.info(f"Created parallel scan cursor: {cursor_token}")
+    return items, cursor_token
+
+def get_persons_with_birthday(month_day: str, batch_size: int = 100) -> List[Dict[str, Any]]:
+    """Get living persons whose birthday is on a given day from the birthday index.
+
+    Args:
+        month_day: Birthday as MM-DD
+        batch_size: Page size passed as Limit
+
+    Returns:
+        List of person records
+    """
+    params = projection_params()
+    params.update({
+        'IndexName': BIRTHDAY_INDEX_NAME,
+        'KeyConditionExpression': '#birthday = :birthday',
+        'FilterExpression': 'attribute_not_exists(DeathDate)',
+        'ExpressionAttributeNames': dict(params.get('ExpressionAttributeNames', {}), **{'#birthday': BIRTH_MONTH_DAY_ATTRIBUTE}),
+        'ExpressionAttributeValues': {':birthday': month_day}
+    })
+    items, _ = _read_pages(table.query, params, batch_size=batch_size, label=f"Querying birthdays on {month_day}")
+    return items
+
 def prepare_person_for_update(person: Dict[str, Any]) -> Dict[str, Any]:
     """Prepare a person record for DynamoDB update.
     
@@ -134,8 +514,8 @@ def prepare_person_for_update(person: Dict[str, Any]) -> Dict[str, Any]:
     Returns:
         Prepared person record
     """
-    # Make a copy to avoid modifying the original
-    person_copy = person.copy()
+    # Make a copy to avoid modifying the original; None marks removed attributes
+    person_copy = {key: value for key, value in person.items() if not key.startswith('_') and value is not None}
     
     # Ensure SK is DETAILS
     person_copy['SK'] = 'DETAILS'
@@ -151,10 +531,269 @@ def prepare_person_for_update(person: Dict[str, Any]) -> Dict[str, Any]:
     if 'DeathDate' in person_copy and isinstance(person_copy['DeathDate'], datetime):
         person_copy['DeathDate'] = format_date(person_copy['DeathDate'])
     
+    # Keep the sparse alive and birthday indexes in sync: only persons without a DeathDate are indexed
+    if person_copy.get('DeathDate'):
+        person_copy.pop(ALIVE_ATTRIBUTE, None)
+        person_copy.pop(BIRTH_MONTH_DAY_ATTRIBUTE, None)
+    else:
+        person_copy[ALIVE_ATTRIBUTE] = ALIVE_VALUE
+        month_day = birth_month_day(person_copy.get('BirthDate'))
+        if month_day:
+            person_copy[BIRTH_MONTH_DAY_ATTRIBUTE] = month_day
+        else:
+            person_copy.pop(BIRTH_MONTH_DAY_ATTRIBUTE, None)
+    
     return person_copy
 
+def build_person_update(person: Dict[str, Any]) -> Dict[str, Any]:
+    """Build UpdateItem parameters that write only the changed attributes.
+
+    Records read with a projection are partial, so they must not be put back
+    whole. Changed attributes set to None are removed, and the sparse index
+    attributes follow the DeathDate and BirthDate. The update is conditional
+    on the item still existing, so persons deleted mid-run are not re-created.
+
+    Args:
+        person: Person record with changed attributes marked via mark_changed
+
+    Returns:
+        Parameters for table.update_item, or None if nothing changed
+    """
+    prepared = prepare_person_for_update(person)
+    changed = get_changed_attributes(person) - {'PK', 'SK'}
+    for attribute in (ALIVE_ATTRIBUTE, BIRTH_MONTH_DAY_ATTRIBUTE):
+        if person.get(attribute) != prepared.get(attribute):
+            changed.add(attribute)
+    if not changed:
+        return None
+    
+    names = {}
+    values = {}
+    set_clauses = []
+    remove_clauses = []
+    for i, attribute in enumerate(sorted(changed)):
+        names[f'#a{i}'] = attribute
+        if prepared.get(attribute) is None:
+            remove_clauses.append(f'#a{i}')
+        else:
+            values[f':v{i}'] = prepared[attribute]
+            set_clauses.append(f'#a{i} = :v{i}')
+    
+    update_expression = ' '.join(
+        clause for clause in (
+            'SET ' + ', '.join(set_clauses) if set_clauses else '',
+            'REMOVE ' + ', '.join(remove_clauses) if remove_clauses else ''
+        ) if clause
+    )
+    params = {
+        'Key': {'PK': prepared['PK'], 'SK': prepared['SK']},
+        'UpdateExpression': update_expression,
+        'ConditionExpression': 'attribute_exists(PK)',
+        'ExpressionAttributeNames': names
+    }
+    if values:
+        params['ExpressionAttributeValues'] = values
+    return params
+
+def update_person_attributes(person: Dict[str, Any], target_table=None) -> Dict[str, Any]:
+    """Write the changed attributes of a single person with UpdateItem.
+
+    Args:
+        person: Person record with changed attributes marked via mark_changed
+        target_table: Table to write to (defaults to the module-level table)
+
+    Returns:
+        Outcome dict with the person's PK and Name, a status of 'updated',
+        'unchanged', 'skipped' (deleted since read) or 'failed', and the
+        error for failures
+    """
+    outcome = {'PK': person.get('PK'), 'Name': person.get('Name', 'Unknown'), 'status': WRITE_UPDATED}
+    try:
+        params = build_person_update(person)
+        if params is None:
+            logger.debug(f"No changed attributes to write for {outcome['Name']}")
+            outcome['status'] = WRITE_UNCHANGED
+            return outcome
+        logger.debug(f"Updating {outcome['Name']}: {params['UpdateExpression']}")
+        (target_table or table).update_item(**params)
+    except ClientError as e:
+        if not _is_conditional_check_failed(e):
+            logger.error(f"Error updating person {outcome['Name']}: {e}")
+            outcome['status'] = WRITE_FAILED
+            outcome['error'] = str(e)
+        else:
+            logger.info(f"Skipping {outcome['Name']}: the person was deleted")
+            outcome['status'] = WRITE_SKIPPED
+    except Exception as e:
+        logger.error(f"Error updating person {outcome['Name']}: {e}")
+        outcome['status'] = WRITE_FAILED
+        outcome['error'] = str(e)
+    return outcome
+
+def update_persons_attributes(persons: List[Dict[str, Any]], max_workers: int = None) -> List[Dict[str, Any]]:
+    """Write the changed attributes of many persons with concurrent UpdateItem calls.
+
+    Workers come from a shared pool of max_workers threads, and each thread
+    writes through its own boto3 session, built once per thread.
+
+    Args:
+        persons: Person records with changed attributes marked via mark_changed
+        max_workers: Maximum concurrent UpdateItem calls (defaults to WRITE_WORKERS)
+
+    Returns:
+        One outcome dict per person, in input order (see update_person_attributes)
+    """
+    max_workers = max_workers or WRITE_WORKERS
+    if max_workers <= 1 or len(persons) <= 1:
+        return [update_person_attributes(person) for person in persons]
+    
+    logger.info(f"Writing {len(persons)} persons with {max_workers} UpdateItem workers")
+    executor = _get_worker_pool('write', max_workers)
+    return list(executor.map(lambda person: update_person_attributes(person, _get_thread_table()), persons))
+
+class BatchWriter:
+    """Write PutRequests with batch_write_item, retrying UnprocessedItems as batches.
+
+    Unprocessed items and throttling errors are resubmitted as a batch after an
+    exponential backoff with full jitter, within a bounded number of retries
+    and total time. Only batches rejected with a non-retryable error are split
+    in halves, down to single items, to isolate the bad ones; the halves share
+    the retry and time budget of the batch they came from.
+    """
+
+    def __init__(self, table_name: str, max_batch_size: int = 25, max_retries: int = None,
+                 max_seconds: float = None, base_delay: float = BATCH_WRITE_BASE_DELAY,
+                 max_delay: float = BATCH_WRITE_MAX_DELAY, resource=None):
+        self.table_name = table_name
+        self.max_batch_size = max_batch_size
+        self.max_retries = BATCH_WRITE_MAX_RETRIES if max_retries is None else max_retries
+        self.max_seconds = BATCH_WRITE_MAX_SECONDS if max_seconds is None else max_seconds
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.resource = resource or dynamodb
+        self._stats = {
+            'batches': 0,
+            'retries': 0,
+            'throttleEvents': 0,
+            'unprocessedItems': 0,
+            'splits': 0,
+            'consumedCapacityUnits': 0.0
+        }
+
+    def write(self, requests: List[Dict[str, Any]]) -> tuple[int, int]:
+        """Write all requests in batches of max_batch_size.
+
+        Args:
+            requests: Write requests such as {'PutRequest': {'Item': ...}}
+
+        Returns:
+            Tuple of (success_count, failure_count)
+        """
+        success_count = 0
+        failure_count = 0
+        for i in range(0, len(requests), self.max_batch_size):
+            written, failed = self._write_batch(requests[i:i + self.max_batch_size])
+            success_count += written
+            failure_count += failed
+        return success_count, failure_count
+
+    def stats(self) -> Dict[str, Any]:
+        """Get counters for batches, retries, throttling and consumed capacity."""
+        return dict(self._stats)
+
+    def _backoff(self, budget: Dict[str, Any]) -> bool:
+        """Sleep before the next retry if the retry budget allows it.
+
+        Args:
+            budget: Retries used so far ('attempt') and the 'deadline', updated in place
+
+        Returns:
+            False when the retry count or total time budget is exhausted
+        """
+        attempt = budget['attempt']
+        delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+        delay = random.uniform(0, delay)
+        if attempt >= self.max_retries or time.monotonic() + delay > budget['deadline']:
+            return False
+        self._stats['retries'] += 1
+        budget['attempt'] += 1
+        time.sleep(delay)
+        return True
+
+    def _record_capacity(self, response: Dict[str, Any]) -> None:
+        for capacity in response.get('ConsumedCapacity', []):
+            self._stats['consumedCapacityUnits'] += float(capacity.get('CapacityUnits', 0))
+
+    def _write_batch(self, requests: List[Dict[str, Any]], budget: Dict[str, Any] = None) -> tuple[int, int]:
+        """Write one batch, resubmitting unprocessed items until done or out of budget.
+
+        Args:
+            requests: Write requests of the batch
+            budget: Retry budget shared with the batch this one was split from;
+                a new batch gets max_retries and max_seconds
+        """
+        if budget is None:
+            budget = {'attempt': 0, 'deadline': time.monotonic() + self.max_seconds}
+        success_count = 0
+        pending = requests
+        
+        while pending:
+            self._stats['batches'] += 1
+            logger.info(f"Performing batch write with {len(pending)} items")
+            try:
+                response = self.resource.batch_write_item(
+                    RequestItems={self.table_name: pending},
+                    ReturnConsumedCapacity='TOTAL'
+                )
+            except ClientError as e:
+                code = e.response.get('Error', {}).get('Code')
+                if code not in RETRYABLE_WRITE_ERROR_CODES:
+                    return self._split_batch(pending, e, success_count, budget)
+                self._stats['throttleEvents'] += 1
+                logger.warning(f"Batch write throttled ({code}), retrying {len(pending)} items")
+            except BotoCoreError as e:
+                logger.warning(f"Batch write failed ({e}), retrying {len(pending)} items")
+            else:
+                self._record_capacity(response)
+                unprocessed = response.get('UnprocessedItems', {}).get(self.table_name, [])
+                success_count += len(pending) - len(unprocessed)
+                if not unprocessed:
+                    break
+                self._stats['throttleEvents'] += 1
+                self._stats['unprocessedItems'] += len(unprocessed)
+                logger.warning(f"{len(unprocessed)} items were not processed in batch, resubmitting")
+                pending = unprocessed
+            
+            if not self._backoff(budget):
+                logger.error(f"Giving up on {len(pending)} items after {budget['attempt'] + 1} batch write attempts")
+                return success_count, len(pending)
+        
+        return success_count, 0
+
+    def _split_batch(self, requests: List[Dict[str, Any]], error: Exception, success_count: int,
+                     budget: Dict[str, Any]) -> tuple[int, int]:
+        """Split a batch rejected with a non-retryable error to isolate the bad items."""
+        if len(requests) == 1:
+            item = requests[0].get('PutRequest', {}).get('Item', {})
+            logger.error(f"Error writing {item.get('Name', item.get('PK', 'Unknown'))}: {error}")
+            return success_count, 1
+        
+        self._stats['splits'] += 1
+        logger.warning(f"Batch write of {len(requests)} items rejected ({error}), splitting")
+        middle = len(requests) // 2
+        failure_count = 0
+        for half in (requests[:middle], requests[middle:]):
+            written, failed = self._write_batch(half, budget)
+            success_count += written
+            failure_count += failed
+        return success_count, failure_count
+
 def batch_update_persons(persons: List[Dict[str, Any]], max_batch_size: int = 25) -> tuple[int, int]:
-    """Update multiple person records in DynamoDB using batch operations.
+    """Update multiple person records in DynamoDB.
+    
+    In the default 'update' write mode only the changed attributes of each
+    person are written with concurrent UpdateItem calls. In 'put' write mode
+    whole items are written with batch PutRequests.
     
     Args:
         persons: List of person records to update
@@ -166,74 +805,159 @@ def batch_update_persons(persons: List[Dict[str, Any]], max_batch_size: int = 25
     success_count = 0
     failure_count = 0
     
-    # Process in chunks of max_batch_size
-    for i in range(0, len(persons), max_batch_size):
-        chunk = persons[i:i + max_batch_size]
-        batch_items = []
-        
-        # Prepare each person for update
-        for person in chunk:
-            try:
-                prepared_person = prepare_person_for_update(person)
-                batch_items.append({
-                    'PutRequest': {
-                        'Item': prepared_person
-                    }
-                })
-                logger.debug(f"Prepared {prepared_person.get('Name', 'Unknown')} for batch update")
-            except Exception as e:
-                logger.error(f"Error preparing person {person.get('Name', 'Unknown')} for batch update: {e}")
-                failure_count += 1
-        
-        # Skip if no items to update
-        if not batch_items:
-            continue
-        
-        # Perform batch write
+    if WRITE_MODE != WRITE_MODE_PUT:
+        outcomes = update_persons_attributes(persons)
+        failed = [outcome for outcome in outcomes if outcome['status'] == WRITE_FAILED]
+        skipped = sum(1 for outcome in outcomes if outcome['status'] == WRITE_SKIPPED)
+        for outcome in failed:
+            logger.warning(f"Update failed for {outcome['Name']} ({outcome['PK']}): {outcome['error']}")
+        success_count = len(outcomes) - len(failed) - skipped
+        failure_count = len(failed)
+        logger.info(f"Batch update complete: {success_count} succeeded, {failure_count} failed, "
+                    f"{skipped} skipped as deleted")
+        return success_count, failure_count
+    
+    batch_items = []
+    for person in persons:
         try:
-            logger.info(f"Performing batch write with {len(batch_items)} items")
-            
-            # DynamoDB batch_write_item requires a dict with table name as key
-            response = dynamodb.batch_write_item(
-                RequestItems={
-                    os.environ['TABLE_NAME']: batch_items
+            prepared_person = prepare_person_for_update(person)
+            batch_items.append({
+                'PutRequest': {
+                    'Item': prepared_person
                 }
-            )
-            
-            # Check for unprocessed items
-            unprocessed = response.get('UnprocessedItems', {}).get(os.environ['TABLE_NAME'], [])
-            if unprocessed:
-                logger.warning(f"{len(unprocessed)} items were not processed in batch")
-                
-                # Try to process unprocessed items individually
-                for item in unprocessed:
-                    try:
-                        put_request = item.get('PutRequest', {})
-                        if put_request and 'Item' in put_request:
-                            table.put_item(Item=put_request['Item'])
-                            success_count += 1
-                            logger.info("Successfully processed unprocessed item individually")
-                    except Exception as e:
-                        logger.error(f"Error processing unprocessed item: {e}")
-                        failure_count += 1
-            
-            # Count successful updates
-            success_count += len(batch_items) - len(unprocessed)
-            
+            })
+            logger.debug(f"Prepared {prepared_person.get('Name', 'Unknown')} for batch update")
         except Exception as e:
-            logger.error(f"Error performing batch write: {e}")
-            
-            # Try to process items individually on batch failure
-            logger.info(f"Attempting to process {len(batch_items)} items individually after batch failure")
-            for item in batch_items:
-                try:
-                    put_request = item.get('PutRequest', {})
-                    if put_request and 'Item' in put_request:
-                        table.put_item(Item=put_request['Item'])
-                        success_count += 1
-                except Exception as individual_error:
-                    logger.error(f"Error updating person individually: {individual_error}")
-                    failure_count += 1
+            logger.error(f"Error preparing person {person.get('Name', 'Unknown')} for batch update: {e}")
+            failure_count += 1
+    
+    writer = BatchWriter(os.environ['TABLE_NAME'], max_batch_size=max_batch_size)
+    written, failed = writer.write(batch_items)
+    success_count += written
+    failure_count += failed
     
     logger.info(f"Batch update complete: {success_count} succeeded, {failure_count} failed")
+    logger.info(f"Batch writer stats: {json.dumps(writer.stats())}")
     return success_count, failure_count
+
+def index_unmarked_persons(batch_size: int = 100) -> int:
+    """Give living persons that lack the Alive attribute their sparse index attributes.
+
+    Persons created without the sparse index attributes are invisible to
+    the alive index until they are marked. The sweep reads every person,
+    dead ones included, so it is a maintenance routine for
+    scripts/backfill_alive_index.py rather than part of the nightly run.
+    It queries the SK-PK-index GSI and falls back to a table scan when that
+    index is missing.
+
+    Args:
+        batch_size: Page size passed as Limit
+
+    Returns:
+        Number of persons marked
+    """
+    filter_expression = 'attribute_not_exists(#alive) AND attribute_not_exists(DeathDate)'
+    common_params = {
+        'ProjectionExpression': 'PK, SK, BirthDate, DeathDate, #alive, #birthday',
+        'ExpressionAttributeNames': {'#alive': ALIVE_ATTRIBUTE, '#birthday': BIRTH_MONTH_DAY_ATTRIBUTE},
+        'ExpressionAttributeValues': {':pk_prefix': 'PERSON#', ':sk': 'DETAILS'}
+    }
+    strategies = [
+        (PERSON_INDEX_NAME, table.query, dict(
+            common_params,
+            IndexName=PERSON_INDEX_NAME,
+            KeyConditionExpression='SK = :sk AND begins_with(PK, :pk_prefix)',
+            FilterExpression=filter_expression
+        )),
+        (None, table.scan, dict(
+            common_params,
+            FilterExpression=f'begins_with(PK, :pk_prefix) AND SK = :sk AND {filter_expression}'
+        ))
+    ]
+    
+    for index_name, operation, params in strategies:
+        try:
+            items, _ = _read_pages(operation, params, batch_size=batch_size, label='Sweeping unmarked persons')
+            break
+        except ClientError as e:
+            if not index_name or not _is_missing_index_error(e):
+                raise
+            logger.warning(f"Index {index_name} not available ({e}), falling back")
+    
+    marked = 0
+    for item in items:
+        params = build_person_update(item)
+        if not params:
+            continue
+        try:
+            table.update_item(**params)
+            marked += 1
+        except ClientError as e:
+            if not _is_conditional_check_failed(e):
+                raise
+    
+    logger.info(f"Marked {marked} of {len(items)} unmarked persons for the alive index")
+    return marked
+
+def backfill_alive_index(dry_run: bool = False) -> Dict[str, int]:
+    """Set or remove the sparse index attributes on every existing person.
+
+    Maintains the Alive attribute of the alive index and the BirthMonthDay
+    attribute of the birthday index. One-off maintenance routine to run
+    before switching readers to these indexes; safe to re-run.
+
+    Args:
+        dry_run: Only count the items that would change
+
+    Returns:
+        Counts of persons scanned, marked alive, unmarked, and with their
+        birthday key set or removed
+    """
+    counts = {'scanned': 0, 'marked': 0, 'unmarked': 0, 'birthdaysSet': 0, 'birthdaysRemoved': 0}
+    scan_params = {
+        'FilterExpression': 'begins_with(PK, :pk_prefix) AND SK = :sk',
+        'ProjectionExpression': 'PK, SK, BirthDate, DeathDate, #alive, #birthday',
+        'ExpressionAttributeNames': {'#alive': ALIVE_ATTRIBUTE, '#birthday': BIRTH_MONTH_DAY_ATTRIBUTE},
+        'ExpressionAttributeValues': {':pk_prefix': 'PERSON#', ':sk': 'DETAILS'}
+    }
+    
+    while True:
+        response = table.scan(**scan_params)
+        for item in response.get('Items', []):
+            counts['scanned'] += 1
+            prepared = prepare_person_for_update(item)
+            
+            if prepared.get(ALIVE_ATTRIBUTE) != item.get(ALIVE_ATTRIBUTE):
+                counts['marked' if ALIVE_ATTRIBUTE in prepared else 'unmarked'] += 1
+            if prepared.get(BIRTH_MONTH_DAY_ATTRIBUTE) != item.get(BIRTH_MONTH_DAY_ATTRIBUTE):
+                counts['birthdaysSet' if BIRTH_MONTH_DAY_ATTRIBUTE in prepared else 'birthdaysRemoved'] += 1
+            
+            params = build_person_update(item)
+            if params and not dry_run:
+                try:
+                    table.update_item(**params)
+                except ClientError as e:
+                    # Deleted since the scan read it
+                    if not _is_conditional_check_failed(e):
+                        raise
+        
+        last_evaluated_key = response.get('LastEvaluatedKey')
+        if not last_evaluated_key:
+            break
+        scan_params['ExclusiveStartKey'] = last_evaluated_key
+    
+    logger.info(f"Index attribute backfill complete: {json.dumps(counts)}")
+    return counts
+
+async def async_get_persons_without_death_date(max_items: int = None, start_key: Dict[str, Any] = None,
+                                              force_recheck: bool = FORCE_RECHECK) -> tuple[List[Dict[str, Any]], str]:
+    """Async variant of get_persons_without_death_date.
+
+    boto3 is blocking, so the read runs on the default executor and the event
+    loop stays free for in-flight Wikimedia requests.
+    """
+    return await asyncio.to_thread(get_persons_without_death_date, max_items, start_key, force_recheck)
+
+async def async_batch_update_persons(persons: List[Dict[str, Any]], max_batch_size: int = 25) -> tuple[int, int]:
+    """Async variant of batch_update_persons, run on the default executor."""
+    return await asyncio.to_thread(batch_update_persons, persons, max_batch_size)
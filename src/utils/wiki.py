@@ -4,83 +4,786 @@ Wikipedia/Wikidata utilities for fetching person information
 
 import os
 import time
+import asyncio
+import hashlib
 import logging
 import json
 import random
-from functools import lru_cache
-from datetime import datetime
+import threading
+from datetime import date, datetime
+from urllib.parse import urlparse
 import requests
-from typing import Optional, Dict, Any
+from requests.adapters import HTTPAdapter
+from typing import Optional, Awaitable, Callable, Dict, Any, List, NamedTuple, Tuple
+
+from utils.cache import TieredCache, create_tiered_cache
 
 # Constants
 USER_AGENT = os.environ.get(
     "USER_AGENT",
     "DeadpoolStatusChecker/1.0 (https://github.com/yourusername/deadpool-status; your-email@example.com)"
 )
+DEFAULT_HEADERS = {
+    "User-Agent": USER_AGENT,
+    "Accept": "application/json",
+    "Accept-Language": "en-US,en;q=0.5"
+}
+HTTP_POOL_SIZE = int(os.environ.get("HTTP_POOL_SIZE", "10"))  # Pooled connections per host
+HTTP_TIMEOUT = 10  # Request timeout in seconds
+WIKIDATA_API_URL = "https://www.wikidata.org/w/api.php"
+WIKIPEDIA_API_URL = "https://en.wikipedia.org/w/api.php"
 BASE_DELAY = 2  # Base delay in seconds
 MAX_DELAY = 60  # Maximum delay in seconds
 JITTER = 0.5    # Random jitter factor
+RATE_LIMIT = float(os.environ.get("WIKI_RATE_LIMIT", "5"))  # Requests per second per host
+RATE_BURST = int(os.environ.get("WIKI_RATE_BURST", "10"))   # Requests allowed back to back
+MIN_CONCURRENCY = int(os.environ.get("WIKI_MIN_CONCURRENCY", "1"))
+MAX_CONCURRENCY = int(os.environ.get("WIKI_MAX_CONCURRENCY", "16"))
+INITIAL_CONCURRENCY = int(os.environ.get("WIKI_INITIAL_CONCURRENCY", "4"))
+MAXLAG = int(os.environ.get("WIKIDATA_MAXLAG", "5"))  # Seconds of replication lag Wikidata may have
+THROTTLE_STATUS_CODES = (429, 503)
+BREAKER_FAILURE_THRESHOLD = int(os.environ.get("WIKI_BREAKER_THRESHOLD", "5"))  # Failed requests in a row that open a circuit
+BREAKER_COOLDOWN = float(os.environ.get("WIKI_BREAKER_COOLDOWN", "60"))  # Seconds an open circuit rejects requests
+
+BIRTH_DATE_PROP = "P569"
+DEATH_DATE_PROP = "P570"
+ENTITY_PROPS = (BIRTH_DATE_PROP, DEATH_DATE_PROP)  # Properties extracted per entity fetch
+
+# Wikidata time precisions (see https://www.wikidata.org/wiki/Help:Dates#Precision)
+PRECISION_YEAR = 9
+PRECISION_MONTH = 10
+PRECISION_DAY = 11
+
+MAX_IDS_PER_REQUEST = 50  # wbgetentities limit for ids/titles per call
+
+# Reasons a page title does not resolve to a person's QID
+LOOKUP_PAGE_MISSING = "page_missing"
+LOOKUP_NO_ENTITY = "no_entity"
+LOOKUP_AMBIGUOUS = "ambiguous"
+ENTITY_CACHE_SIZE = int(os.environ.get("ENTITY_CACHE_SIZE", "1024"))  # Entries kept in memory
+WIKI_CACHE_PATH = os.environ.get("WIKI_CACHE_PATH", "/tmp/wiki_cache.sqlite3")  # '' keeps the cache in memory only
+FACTS_CACHE_TTL = int(os.environ.get("WIKI_CACHE_TTL", "3600"))  # Seconds entity facts stay cached
+TITLE_CACHE_TTL = int(os.environ.get("WIKI_TITLE_CACHE_TTL", "604800"))  # Seconds title to QID lookups stay cached
+WIKI_CACHE_TABLE = os.environ.get("WIKI_CACHE_TABLE", "")  # Shared DynamoDB cache table, '' disables it
+WIKI_CACHE_ENDPOINT_URL = os.environ.get("WIKI_CACHE_ENDPOINT_URL") or None  # e.g. DynamoDB Local
+FACTS_CACHE_PREFIX = "facts:"
+TITLE_CACHE_PREFIX = "title:"
 
 # Configure logging
 logger = logging.getLogger()
 
-def fetch_wikidata(params: Dict[str, Any], retries: int = 5, base_delay: float = BASE_DELAY) -> Optional[Dict[str, Any]]:
-    """Fetch Wikidata with exponential backoff retries on failure.
+class TokenBucketLimiter:
+    """Per-host token bucket limiting the rate of outgoing requests.
+
+    Each host gets a bucket holding up to ``burst`` tokens that refills at
+    ``rate`` tokens per second. Tokens are reserved up front, so concurrent
+    callers queue behind each other instead of all waking at once.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+        self._total_wait = 0.0
+        self._delayed_requests = 0
+
+    def reserve(self, host: str) -> float:
+        """Take a token for host and return how long to wait before using it."""
+        if self.rate <= 0:
+            return 0.0
+
+        with self._lock:
+            now = time.monotonic()
+            tokens, last = self._buckets.get(host, (float(self.burst), now))
+            tokens = min(float(self.burst), tokens + (now - last) * self.rate) - 1
+            self._buckets[host] = (tokens, now)
+            wait = -tokens / self.rate if tokens < 0 else 0.0
+            if wait > 0:
+                self._total_wait += wait
+                self._delayed_requests += 1
+            return wait
+
+    def acquire(self, host: str) -> float:
+        """Block until a request to host is allowed.
+
+        Returns:
+            Seconds spent waiting
+        """
+        wait = self.reserve(host)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def stats(self) -> Dict[str, Any]:
+        """Get limiter settings and the total time callers spent waiting."""
+        with self._lock:
+            return {
+                "rate": self.rate,
+                "burst": self.burst,
+                "delayedRequests": self._delayed_requests,
+                "totalWaitSeconds": round(self._total_wait, 3)
+            }
+
+class AdaptiveConcurrencyController:
+    """AIMD controller for the number of in-flight Wikimedia requests.
+
+    The allowed concurrency grows by one for every ``limit`` healthy
+    responses and is cut by ``decrease_factor`` whenever Wikimedia throttles
+    us (429/503 or a maxlag error). A Retry-After from any response blocks
+    all callers until it has expired.
+    """
+
+    def __init__(self, initial: int, minimum: int, maximum: int, decrease_factor: float = 0.5):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.decrease_factor = decrease_factor
+        self._limit = float(min(self.maximum, max(self.minimum, initial)))
+        self._in_flight = 0
+        self._peak_in_flight = 0
+        self._throttle_events = 0
+        self._blocked_until = 0.0
+        self._cond = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        """Current number of requests allowed in flight."""
+        return int(self._limit)
+
+    def try_acquire(self) -> bool:
+        """Take an in-flight slot if one is free, without blocking."""
+        with self._cond:
+            if self._in_flight >= self.limit:
+                return False
+            self._in_flight += 1
+            self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+            return True
+
+    def acquire(self) -> None:
+        """Block until an in-flight slot is free and take it."""
+        with self._cond:
+            while self._in_flight >= self.limit:
+                self._cond.wait()
+            self._in_flight += 1
+            self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+
+    def release(self) -> None:
+        """Give back an in-flight slot."""
+        with self._cond:
+            self._in_flight = max(0, self._in_flight - 1)
+            self._cond.notify_all()
+
+    def on_success(self) -> None:
+        """Additively grow the limit after a healthy response."""
+        with self._cond:
+            self._limit = min(float(self.maximum), self._limit + 1.0 / self._limit)
+            self._cond.notify_all()
+
+    def on_throttle(self, retry_after: Optional[float] = None) -> None:
+        """Multiplicatively cut the limit and honor Retry-After globally."""
+        with self._cond:
+            self._throttle_events += 1
+            self._limit = max(float(self.minimum), self._limit * self.decrease_factor)
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+            logger.info(f"Reduced Wikimedia concurrency to {self.limit}")
+
+    def blocked_for(self) -> float:
+        """Seconds left until the global Retry-After expires."""
+        with self._cond:
+            return max(0.0, self._blocked_until - time.monotonic())
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the current concurrency level and throttle counters."""
+        with self._cond:
+            return {
+                "limit": self.limit,
+                "inFlight": self._in_flight,
+                "peakInFlight": self._peak_in_flight,
+                "throttleEvents": self._throttle_events
+            }
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request while the circuit of its host is open."""
+
+    def __init__(self, host: str, retry_in: float):
+        super().__init__(f"Circuit open for {host}, retrying in {retry_in:.0f} seconds")
+        self.host = host
+        self.retry_in = retry_in
+
+class CircuitBreaker:
+    """Per-host circuit breaker so callers fail fast while Wikimedia is degraded.
+
+    A host's circuit opens after ``failure_threshold`` requests in a row
+    failed, each counted once after its retries ran out, and rejects every
+    request with CircuitOpenError for ``cooldown`` seconds. Then it is
+    half-open: a single probe request is let through, which closes the
+    circuit on success and opens it again as soon as an attempt fails.
+    Only network errors, timeouts and 5xx responses count as failures: 4xx
+    responses and invalid JSON come from a host that answered, and
+    throttling (429 and maxlag) is left to AdaptiveConcurrencyController.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, cooldown: float):
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        # host -> [state, failed requests in a row, when it opened or the last probe was sent]
+        self._circuits: Dict[str, List[Any]] = {}
+        self._opened = 0
+        self._rejected = 0
+
+    def _circuit(self, host: str) -> List[Any]:
+        return self._circuits.setdefault(host, [self.CLOSED, 0, 0.0])
+
+    def check(self, host: str) -> None:
+        """Raise CircuitOpenError if requests to host are currently rejected."""
+        with self._lock:
+            self._reject_if_open(host, reserve=False)
+
+    def before_request(self, host: str) -> None:
+        """Let a request to host through or raise CircuitOpenError.
+
+        Once the cool-down has passed, the first caller becomes the half-open
+        probe and everyone else keeps failing fast until it reports back, or
+        until another cool-down has passed without an answer.
+        """
+        with self._lock:
+            self._reject_if_open(host, reserve=True)
+
+    def _reject_if_open(self, host: str, reserve: bool) -> None:
+        circuit = self._circuit(host)
+        if circuit[0] == self.CLOSED:
+            return
+        retry_in = circuit[2] + self.cooldown - time.monotonic()
+        if retry_in <= 0:
+            if reserve:
+                circuit[0] = self.HALF_OPEN
+                circuit[2] = time.monotonic()
+                logger.info(f"Circuit for {host} half-open, sending a probe request")
+            return
+        self._rejected += 1
+        raise CircuitOpenError(host, retry_in)
+
+    def on_success(self, host: str) -> None:
+        """Close the circuit of host after a healthy response."""
+        with self._lock:
+            if self._circuit(host)[0] != self.CLOSED:
+                logger.info(f"Circuit for {host} closed")
+            self._circuits[host] = [self.CLOSED, 0, 0.0]
+
+    def on_attempt_failure(self, host: str) -> None:
+        """Open a half-open circuit again when an attempt of its probe fails.
+
+        Failed attempts while the circuit is closed are left to the caller's
+        retries; the request is counted by on_failure once it gives up, so a
+        single failing request cannot open the circuit on its own.
+        """
+        with self._lock:
+            circuit = self._circuit(host)
+            if circuit[0] == self.HALF_OPEN:
+                self._open(host, circuit)
+
+    def on_failure(self, host: str) -> None:
+        """Count a request that failed after all its retries, opening the circuit at the threshold."""
+        with self._lock:
+            circuit = self._circuit(host)
+            circuit[1] += 1
+            if circuit[0] == self.HALF_OPEN or (circuit[0] == self.CLOSED and circuit[1] >= self.failure_threshold):
+                self._open(host, circuit)
+
+    def _open(self, host: str, circuit: List[Any]) -> None:
+        self._opened += 1
+        self._circuits[host] = [self.OPEN, circuit[1], time.monotonic()]
+        logger.warning(f"Circuit for {host} opened after {circuit[1]} failed requests, "
+                       f"rejecting requests for {self.cooldown:.0f} seconds")
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the state of every circuit and how often requests were rejected."""
+        with self._lock:
+            return {
+                "circuits": {host: circuit[0] for host, circuit in self._circuits.items()},
+                "opened": self._opened,
+                "rejectedRequests": self._rejected
+            }
+
+# Result of a single-flight key whose request gave no answer
+_NO_RESULT = object()
+
+class _Flight:
+    """An in-flight request for one key that other threads can wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = _NO_RESULT
+
+class SingleFlight:
+    """Collapses concurrent lookups of the same keys into one in-flight request.
+
+    The first caller asking for a key fetches it; callers asking for the same
+    key while that request is in flight wait for it and share its result
+    instead of sending their own. Keys are only tracked while in flight, so
+    this complements the lookup cache rather than replacing it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[Any, _Flight] = {}
+        self._requested = 0
+        self._collapsed = 0
+
+    def do_many(self, keys: List[str], fetch: Callable[[List[str]], Dict[str, Any]],
+                scope: Any = None) -> Dict[str, Any]:
+        """Fetch keys, joining requests already in flight for some of them.
+
+        Args:
+            keys: Keys to look up, duplicates allowed
+            fetch: Called with the keys no one else is fetching; returns results by key
+            scope: Extra part of the in-flight key, e.g. the requested properties
+
+        Returns:
+            Dict mapping each key that got an answer to its result
+        """
+        owned = []
+        joined = {}
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                self._requested += 1
+                flight = self._flights.get((scope, key))
+                if flight is None:
+                    self._flights[(scope, key)] = _Flight()
+                    owned.append(key)
+                else:
+                    joined[key] = flight
+                    self._collapsed += 1
+
+        # Fetch our own keys before waiting on others, so callers never wait on each other in a cycle
+        results = {}
+        try:
+            if owned:
+                results.update(fetch(owned))
+        finally:
+            with self._lock:
+                flights = [(self._flights.pop((scope, key)), key) for key in owned]
+            for flight, key in flights:
+                flight.result = results.get(key, _NO_RESULT)
+                flight.done.set()
+
+        for key, flight in joined.items():
+            flight.done.wait()
+            if flight.result is not _NO_RESULT:
+                results[key] = flight.result
+        return results
+
+    def stats(self) -> Dict[str, int]:
+        """Get how many keys were requested and how many joined an in-flight request."""
+        with self._lock:
+            return {"requested": self._requested, "collapsed": self._collapsed}
+
+class AsyncSingleFlight:
+    """Asyncio variant of SingleFlight for coroutines on one event loop.
+
+    No lock is needed because the bookkeeping never awaits. Entries only live
+    while a request is in flight, so an instance can outlive the event loop.
+    """
+
+    def __init__(self):
+        self._flights: Dict[Any, asyncio.Future] = {}
+        self._requested = 0
+        self._collapsed = 0
+
+    async def do_many(self, keys: List[str], fetch: Callable[[List[str]], Awaitable[Dict[str, Any]]],
+                      scope: Any = None) -> Dict[str, Any]:
+        """Async variant of SingleFlight.do_many."""
+        loop = asyncio.get_running_loop()
+        owned = []
+        joined = {}
+        for key in dict.fromkeys(keys):
+            self._requested += 1
+            future = self._flights.get((scope, key))
+            if future is None:
+                self._flights[(scope, key)] = loop.create_future()
+                owned.append(key)
+            else:
+                joined[key] = future
+                self._collapsed += 1
+
+        results = {}
+        try:
+            if owned:
+                results.update(await fetch(owned))
+        finally:
+            for key in owned:
+                future = self._flights.pop((scope, key))
+                if not future.done():
+                    future.set_result(results.get(key, _NO_RESULT))
+
+        for key, future in joined.items():
+            # Shielded so a cancelled waiter does not cancel the result for the others
+            result = await asyncio.shield(future)
+            if result is not _NO_RESULT:
+                results[key] = result
+        return results
+
+    def stats(self) -> Dict[str, int]:
+        """Get how many keys were requested and how many joined an in-flight request."""
+        return {"requested": self._requested, "collapsed": self._collapsed}
+
+# Shared keep-alive HTTP session, created on first use
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+# Rate limiter applied to every Wikipedia/Wikidata request
+_rate_limiter = TokenBucketLimiter(RATE_LIMIT, RATE_BURST)
+
+# Adaptive limit on in-flight requests across all Wikimedia hosts
+_concurrency = AdaptiveConcurrencyController(INITIAL_CONCURRENCY, MIN_CONCURRENCY, MAX_CONCURRENCY)
+
+# Fails fast per Wikimedia host while it keeps erroring
+_breaker = CircuitBreaker(BREAKER_FAILURE_THRESHOLD, BREAKER_COOLDOWN)
+
+# In-flight title and entity lookups, per engine
+_single_flights = {"titles": SingleFlight(), "entities": SingleFlight()}
+_async_single_flights = {"titles": AsyncSingleFlight(), "entities": AsyncSingleFlight()}
+
+# Extracted entity facts and title lookups, created on first use
+_cache: Optional[TieredCache] = None
+_cache_lock = threading.Lock()
+
+def _create_session(pool_size: int) -> requests.Session:
+    """Create a keep-alive session with a connection pool per host."""
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+    # Retries are handled by _fetch_json, so the adapter never retries on its own
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+def get_session() -> requests.Session:
+    """Get the shared HTTP session, creating it on first use.
+
+    The session lives at module level, so pooled connections survive across
+    warm Lambda invocations.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = _create_session(HTTP_POOL_SIZE)
+        return _session
+
+def configure_http_pool(pool_size: int) -> None:
+    """Replace the shared HTTP session with one using a different pool size.
 
     Args:
-        params: Request parameters for the Wikidata API
+        pool_size: Maximum number of pooled connections kept per host
+    """
+    global _session, HTTP_POOL_SIZE
+    with _session_lock:
+        old_session = _session
+        HTTP_POOL_SIZE = pool_size
+        _session = _create_session(pool_size)
+    if old_session is not None:
+        old_session.close()
+    logger.info(f"Configured HTTP connection pool size of {pool_size}")
+
+def get_connection_stats() -> Dict[str, Dict[str, int]]:
+    """Get per-host connection reuse counters for the shared HTTP session.
+
+    Returns:
+        Dict mapping host to counts of requests sent, connections opened and
+        requests that reused an already open connection
+    """
+    stats = {}
+    with _session_lock:
+        session = _session
+    if session is None:
+        return stats
+
+    for adapter in set(session.adapters.values()):
+        pools = adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            host_stats = stats.setdefault(pool.host, {"requests": 0, "connections": 0, "reused": 0})
+            host_stats["requests"] += pool.num_requests
+            host_stats["connections"] += pool.num_connections
+            host_stats["reused"] = max(0, host_stats["requests"] - host_stats["connections"])
+    return stats
+
+def configure_rate_limit(rate: float, burst: int) -> None:
+    """Replace the shared rate limiter.
+
+    Args:
+        rate: Requests per second allowed per host (0 disables limiting)
+        burst: Number of requests allowed back to back
+    """
+    global _rate_limiter
+    _rate_limiter = TokenBucketLimiter(rate, burst)
+    logger.info(f"Configured rate limit of {rate} requests/second (burst {burst})")
+
+def get_rate_limiter() -> TokenBucketLimiter:
+    """Get the rate limiter shared by all Wikimedia clients."""
+    return _rate_limiter
+
+def get_concurrency_controller() -> AdaptiveConcurrencyController:
+    """Get the concurrency controller shared by all Wikimedia clients."""
+    return _concurrency
+
+def get_circuit_breaker() -> CircuitBreaker:
+    """Get the circuit breaker shared by all Wikimedia clients."""
+    return _breaker
+
+def get_single_flight(kind: str) -> SingleFlight:
+    """Get the thread single-flight layer for "titles" or "entities" lookups."""
+    return _single_flights[kind]
+
+def get_async_single_flight(kind: str) -> AsyncSingleFlight:
+    """Get the asyncio single-flight layer for "titles" or "entities" lookups."""
+    return _async_single_flights[kind]
+
+def get_single_flight_stats() -> Dict[str, Dict[str, int]]:
+    """Get requested and collapsed lookup counts of both engines by kind."""
+    stats = {}
+    for kind in _single_flights:
+        thread_stats = _single_flights[kind].stats()
+        async_stats = _async_single_flights[kind].stats()
+        stats[kind] = {name: thread_stats[name] + async_stats[name] for name in thread_stats}
+    return stats
+
+def get_cache() -> TieredCache:
+    """Get the shared lookup cache: an in-memory LRU in front of an SQLite file in /tmp
+    and, when WIKI_CACHE_TABLE is set, a DynamoDB table.
+
+    The SQLite tier outlives a single invocation, so self-invoked continuation
+    runs on the same warm container reuse earlier lookups; the DynamoDB tier
+    also shares them across cold containers and concurrent invocations.
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = create_tiered_cache(
+                    ENTITY_CACHE_SIZE, WIKI_CACHE_PATH, FACTS_CACHE_TTL,
+                    dynamodb_table=WIKI_CACHE_TABLE, dynamodb_endpoint_url=WIKI_CACHE_ENDPOINT_URL
+                )
+    return _cache
+
+def configure_cache(cache: TieredCache) -> None:
+    """Replace the shared lookup cache, e.g. with other tiers or for tests."""
+    global _cache
+    with _cache_lock:
+        _cache = cache
+
+def get_client_stats() -> Dict[str, Any]:
+    """Get metrics for all Wikipedia/Wikidata client components."""
+    return {
+        "connections": get_connection_stats(),
+        "rateLimiter": _rate_limiter.stats(),
+        "concurrency": _concurrency.stats(),
+        "circuitBreaker": _breaker.stats(),
+        "cache": get_cache().stats(),
+        "singleFlight": get_single_flight_stats()
+    }
+
+def parse_retry_after(value: Optional[str], default: float) -> float:
+    """Parse a Retry-After header given in seconds, falling back to default."""
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return default
+
+def is_maxlag_error(data: Any) -> bool:
+    """Check whether an API response is a maxlag rejection."""
+    return isinstance(data, dict) and isinstance(data.get("error"), dict) and data["error"].get("code") == "maxlag"
+
+def add_maxlag(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Add the configured maxlag parameter to Wikidata request parameters."""
+    if MAXLAG > 0:
+        return {**params, "maxlag": MAXLAG}
+    return params
+
+def retry_delay(attempt: int, base_delay: float) -> float:
+    """Get the jittered exponential backoff before retry attempt ``attempt``."""
+    delay = min(MAX_DELAY, base_delay * (2 ** attempt))
+    return delay + random.uniform(-JITTER * delay, JITTER * delay)
+
+def handle_response(host: str, status: int, headers: Any, data: Any, attempt: int,
+                    base_delay: float) -> Tuple[bool, Optional[float], bool]:
+    """Decide what an answered attempt means for the retry loop, the breaker and the concurrency limit.
+
+    Shared by the sync and async fetch loops so both engines treat throttling,
+    maxlag and host failures the same way. Other error statuses must have been
+    raised and reported through handle_attempt_error instead.
+
+    Args:
+        host: Host the request went to
+        status: HTTP status of the response
+        headers: Response headers
+        data: Parsed JSON body, None for throttled responses
+        attempt: Zero-based attempt number
+        base_delay: Base delay in seconds for exponential backoff
+
+    Returns:
+        Tuple of (whether data is the result, Retry-After to wait before the
+        next attempt or None, whether the attempt failed because of the host)
+    """
+    # Handle rate limiting and overload explicitly
+    if status in THROTTLE_STATUS_CODES:
+        retry_after = parse_retry_after(headers.get('Retry-After'), base_delay * (2 ** attempt))
+        logger.warning(f"Rate limited. Retry-After: {retry_after} seconds")
+        _concurrency.on_throttle(retry_after)
+        # 503 means the service is unavailable, not just that we are too fast
+        host_failed = status >= 500
+        handle_attempt_error(host, host_failed)
+        return False, retry_after, host_failed
+
+    # The host answered, even if it asks us to slow down
+    _breaker.on_success(host)
+
+    # Wikidata answers maxlag rejections with HTTP 200 and an error body
+    if is_maxlag_error(data):
+        retry_after = parse_retry_after(headers.get('Retry-After'), base_delay)
+        logger.warning(f"Server lagged: {data['error'].get('info', '')}. Retry-After: {retry_after} seconds")
+        _concurrency.on_throttle(retry_after)
+        return False, retry_after, False
+
+    _concurrency.on_success()
+    return True, None, False
+
+def handle_attempt_error(host: str, host_failed: bool) -> None:
+    """Report an attempt that failed to the breaker.
+
+    Args:
+        host: Host the request went to
+        host_failed: True for network errors, timeouts and 5xx responses; 4xx
+            responses and invalid JSON come from a host that answered
+    """
+    if host_failed:
+        _breaker.on_attempt_failure(host)
+    else:
+        _breaker.on_success(host)
+
+def handle_retries_exhausted(api_name: str, host: str, host_failed: bool) -> None:
+    """Log a request that gave up and count it against the breaker if the host was at fault."""
+    logger.warning(f"All retries failed for {api_name} fetch")
+    if host_failed:
+        _breaker.on_failure(host)
+
+def _fetch_json(url: str, api_name: str, params: Dict[str, Any], retries: int = 5, base_delay: float = BASE_DELAY,
+                parser: Optional[Callable[[requests.Response], Any]] = None) -> Optional[Dict[str, Any]]:
+    """Fetch a MediaWiki API endpoint with exponential backoff retries on failure.
+
+    Args:
+        url: API endpoint URL
+        api_name: Human readable API name used in log messages
+        params: Request parameters for the API
         retries: Number of retries before giving up
         base_delay: Base delay in seconds for exponential backoff
+        parser: Reads the JSON from a streamed response instead of ``response.json()``
 
     Returns:
         JSON response from the API, or None if all retries fail
+
+    Raises:
+        CircuitOpenError: The circuit of the host is open, so nothing was sent
     """
-    url = "https://www.wikidata.org/w/api.php"
-    headers = {
-        "User-Agent": USER_AGENT,
-        "Accept": "application/json",
-        "Accept-Language": "en-US,en;q=0.5"
-    }
-    
-    logger.info(f"Making Wikidata API request to {url}")
+    host = urlparse(url).hostname
+    logger.info(f"Making {api_name} API request to {url}")
     logger.info(f"Parameters: {json.dumps(params, indent=2)}")
 
+    retry_after = None
+    host_failed = False  # Whether the last attempt failed because of the host
     for attempt in range(retries):
+        # Don't sleep for a retry that the breaker would reject anyway
+        _breaker.check(host)
         try:
-            # Add a small random delay before each request to avoid hitting rate limits
-            if attempt > 0:
-                # Calculate exponential backoff with jitter
-                delay = min(MAX_DELAY, base_delay * (2 ** attempt))
-                jitter_amount = random.uniform(-JITTER * delay, JITTER * delay)
-                actual_delay = delay + jitter_amount
+            # Back off before retries; throttled attempts wait on the global Retry-After instead
+            if attempt > 0 and retry_after is None:
+                actual_delay = retry_delay(attempt, base_delay)
                 logger.info(f"Waiting {actual_delay:.2f} seconds before retry (attempt {attempt + 1}/{retries})...")
                 time.sleep(actual_delay)
+            retry_after = None
+
+            blocked = _concurrency.blocked_for()
+            if blocked > 0:
+                logger.info(f"Waiting {blocked:.2f} seconds for Wikimedia Retry-After to expire")
+                time.sleep(blocked)
             
-            response = requests.get(url, params=params, headers=headers, timeout=10)
-            
-            # Handle rate limiting explicitly
-            if response.status_code == 429:
-                retry_after = int(response.headers.get('Retry-After', base_delay * (2 ** attempt)))
-                logger.warning(f"Rate limited. Retry-After: {retry_after} seconds")
-                if attempt < retries - 1:
-                    time.sleep(retry_after)
-                continue
-                
-            response.raise_for_status()
-            data = response.json()
+            _breaker.before_request(host)
+            _rate_limiter.acquire(host)
+            _concurrency.acquire()
+            try:
+                response = get_session().get(url, params=params, timeout=HTTP_TIMEOUT, stream=parser is not None)
+                try:
+                    data = None
+                    if response.status_code not in THROTTLE_STATUS_CODES:
+                        response.raise_for_status()
+                        data = parser(response) if parser else response.json()
+                finally:
+                    response.close()
+            finally:
+                _concurrency.release()
             
-            # Log success but don't log the entire response which can be large
-            logger.info(f"Wikidata API request successful")
-            return data
+            done, retry_after, host_failed = handle_response(
+                host, response.status_code, response.headers, data, attempt, base_delay
+            )
+            if done:
+                # Log success but don't log the entire response which can be large
+                logger.info(f"{api_name} API request successful")
+                return data
             
-        except (requests.exceptions.RequestException, ValueError) as e:
+        except requests.exceptions.HTTPError as e:
+            logger.error(f"Attempt {attempt + 1} failed: {str(e)}")
+            # 4xx answers mean a bad request, not an unhealthy host
+            host_failed = e.response is not None and e.response.status_code >= 500
+            handle_attempt_error(host, host_failed)
+        except ValueError as e:
+            # Invalid JSON from a host that answered is a problem of this response only
+            logger.error(f"Attempt {attempt + 1} failed: {str(e)}")
+            host_failed = False
+            handle_attempt_error(host, host_failed)
+        except requests.exceptions.RequestException as e:
             logger.error(f"Attempt {attempt + 1} failed: {str(e)}")
-            if attempt >= retries - 1:
-                break
+            host_failed = True
+            handle_attempt_error(host, host_failed)
 
-    logger.warning("All retries failed for Wikidata fetch")
+    handle_retries_exhausted(api_name, host, host_failed)
     return None
 
+def fetch_wikidata(params: Dict[str, Any], retries: int = 5, base_delay: float = BASE_DELAY,
+                   parser: Optional[Callable[[requests.Response], Any]] = None) -> Optional[Dict[str, Any]]:
+    """Fetch Wikidata with exponential backoff retries on failure.
+
+    Args:
+        params: Request parameters for the Wikidata API
+        retries: Number of retries before giving up
+        base_delay: Base delay in seconds for exponential backoff
+        parser: Reads the JSON from a streamed response instead of ``response.json()``
+
+    Returns:
+        JSON response from the API, or None if all retries fail
+    """
+    return _fetch_json(WIKIDATA_API_URL, "Wikidata", add_maxlag(params), retries, base_delay, parser)
+
+def fetch_wikipedia(params: Dict[str, Any], retries: int = 5, base_delay: float = BASE_DELAY) -> Optional[Dict[str, Any]]:
+    """Fetch the English Wikipedia API with exponential backoff retries on failure.
+
+    Args:
+        params: Request parameters for the Wikipedia API
+        retries: Number of retries before giving up
+        base_delay: Base delay in seconds for exponential backoff
+
+    Returns:
+        JSON response from the API, or None if all retries fail
+    """
+    return _fetch_json(WIKIPEDIA_API_URL, "Wikipedia", params, retries, base_delay)
+
 def resolve_redirect(title: str, retries: int = 5, base_delay: float = BASE_DELAY) -> Optional[str]:
     """Resolve Wikipedia page redirects with retry logic.
 
@@ -94,85 +797,176 @@ def resolve_redirect(title: str, retries: int = 5, base_delay: float = BASE_DELA
     """
     try:
         logger.info(f"Resolving Wikipedia page: {title}")
-        wikipedia_api_url = "https://en.wikipedia.org/w/api.php"
         params = {
             "action": "query",
             "titles": title,
             "redirects": 1,
             "format": "json"
         }
-        logger.info(f"Making Wikipedia API request to {wikipedia_api_url}")
-        logger.info(f"Parameters: {json.dumps(params, indent=2)}")
-
-        headers = {
-            "User-Agent": USER_AGENT,
-            "Accept": "application/json",
-            "Accept-Language": "en-US,en;q=0.5"
-        }
-        
-        data = None
-        for attempt in range(retries):
-            try:
-                # Add a small random delay before each request to avoid hitting rate limits
-                if attempt > 0:
-                    # Calculate exponential backoff with jitter
-                    delay = min(MAX_DELAY, base_delay * (2 ** attempt))
-                    jitter_amount = random.uniform(-JITTER * delay, JITTER * delay)
-                    actual_delay = delay + jitter_amount
-                    logger.info(f"Waiting {actual_delay:.2f} seconds before retry (attempt {attempt + 1}/{retries})...")
-                    time.sleep(actual_delay)
-                else:
-                    # Small initial delay
-                    time.sleep(random.uniform(0.5, 1.5))
-                
-                response = requests.get(wikipedia_api_url, params=params, headers=headers, timeout=10)
-                
-                # Handle rate limiting explicitly
-                if response.status_code == 429:
-                    retry_after = int(response.headers.get('Retry-After', base_delay * (2 ** attempt)))
-                    logger.warning(f"Rate limited. Retry-After: {retry_after} seconds")
-                    if attempt < retries - 1:
-                        time.sleep(retry_after)
-                    continue
-                    
-                response.raise_for_status()
-                data = response.json()
-                logger.info(f"Wikipedia API request successful")
-                break
-                
-            except (requests.exceptions.RequestException, ValueError) as e:
-                logger.error(f"Attempt {attempt + 1} failed: {str(e)}")
-                if attempt >= retries - 1:
-                    logger.warning("All retries failed for Wikipedia API request")
-                    return None
-        
-        if not data:
-            return None
 
-        # Handle redirects
-        if "redirects" in data.get("query", {}):
-            redirects = data["query"]["redirects"]
-            title = redirects[-1]["to"]
-            logger.info(f"Resolved redirect to: {title}")
-
-        # Handle normalized titles
-        if "normalized" in data.get("query", {}):
-            title = data["query"]["normalized"][0]["to"]
-            logger.info(f"Normalized title to: {title}")
-        elif "pages" in data.get("query", {}):
-            page_id = next(iter(data["query"]["pages"]))
-            if page_id != "-1":  # -1 indicates page not found
-                title = data["query"]["pages"][page_id]["title"]
-                logger.info(f"Found page title: {title}")
-            else:
-                logger.warning(f"Page not found: {title}")
-                return None
-
-        return title
+        data = fetch_wikipedia(params, retries, base_delay)
+        return parse_redirect_response(title, data)
+    except CircuitOpenError:
+        raise
     except Exception as e:
         logger.error(f"Error resolving redirect for {title}: {str(e)}")
         return None
 
+def parse_redirect_response(title: str, data: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Get the fully resolved title out of a redirects query response.
+
+    Args:
+        title: Page URL title that was queried
+        data: JSON response of the query
+
+    Returns:
+        Fully resolved title or None if not found
+    """
+    if not data:
+        return None
+
+    # Handle redirects
+    if "redirects" in data.get("query", {}):
+        redirects = data["query"]["redirects"]
+        title = redirects[-1]["to"]
+        logger.info(f"Resolved redirect to: {title}")
+
+    # Handle normalized titles
+    if "normalized" in data.get("query", {}):
+        title = data["query"]["normalized"][0]["to"]
+        logger.info(f"Normalized title to: {title}")
+    elif "pages" in data.get("query", {}):
+        page_id = next(iter(data["query"]["pages"]))
+        if page_id != "-1":  # -1 indicates page not found
+            title = data["query"]["pages"][page_id]["title"]
+            logger.info(f"Found page title: {title}")
+        else:
+            logger.warning(f"Page not found: {title}")
+            return None
+
+    return title
+
+def _follow_title_map(title: str, mapping: Dict[str, str]) -> str:
+    """Follow a from->to title mapping (normalization or redirect chain) to its end."""
+    seen = set()
+    while title in mapping and title not in seen:
+        seen.add(title)
+        title = mapping[title]
+    return title
+
+def titles_query_params(titles: List[str]) -> Dict[str, Any]:
+    """Build the pageprops query resolving titles, redirects and QIDs at once."""
+    return {
+        "action": "query",
+        "prop": "pageprops",
+        "ppprop": "wikibase_item|disambiguation",
+        "redirects": 1,
+        "titles": "|".join(titles),
+        "format": "json"
+    }
+
+def parse_titles_response(titles: List[str], data: Optional[Dict[str, Any]]) -> Dict[str, Dict[str, Optional[str]]]:
+    """Map each requested title to its resolved title and QID.
+
+    Args:
+        titles: Titles sent in the query
+        data: JSON response of the pageprops query
+
+    Returns:
+        Dict mapping each title to ``{"title": ..., "wiki_id": ..., "failure": ...}``,
+        where failure is None or a LOOKUP_* reason; empty when the response is unusable
+    """
+    results = {}
+    if not data or "query" not in data:
+        logger.warning(f"Could not resolve pages: {', '.join(titles)}")
+        return results
+
+    query = data["query"]
+    normalized = {n["from"]: n["to"] for n in query.get("normalized", [])}
+    redirects = {r["from"]: r["to"] for r in query.get("redirects", [])}
+    pages = {page["title"]: page for page in query.get("pages", {}).values() if "title" in page}
+
+    for title in titles:
+        resolved_title = _follow_title_map(_follow_title_map(title, normalized), redirects)
+        page = pages.get(resolved_title)
+        if not page or "missing" in page or "invalid" in page:
+            logger.warning(f"Page not found: {title}")
+            results[title] = {"title": None, "wiki_id": None, "failure": LOOKUP_PAGE_MISSING}
+            continue
+
+        pageprops = page.get("pageprops", {})
+        if "disambiguation" in pageprops:
+            # The QID of a disambiguation page is not the person's
+            logger.warning(f"Page is a disambiguation page: {resolved_title}")
+            results[title] = {"title": resolved_title, "wiki_id": None, "failure": LOOKUP_AMBIGUOUS}
+            continue
+
+        wiki_id = pageprops.get("wikibase_item")
+        if wiki_id:
+            logger.info(f"Found Wikidata ID {wiki_id} for page {resolved_title}")
+        else:
+            logger.warning(f"No Wikidata entity found for page: {resolved_title}")
+        results[title] = {"title": resolved_title, "wiki_id": wiki_id, "failure": None if wiki_id else LOOKUP_NO_ENTITY}
+
+    return results
+
+def split_cached_titles(page_titles: List[str]) -> Tuple[Dict[str, Dict[str, Optional[str]]], List[str]]:
+    """Split titles into cached resolutions and titles that still need a lookup.
+
+    Args:
+        page_titles: Page URL titles (end of URL), duplicates allowed
+
+    Returns:
+        Tuple of (cached resolutions by title, list of titles missing from the cache)
+    """
+    titles = list(dict.fromkeys(t for t in page_titles if t))
+    found = get_cache().get_many(TITLE_CACHE_PREFIX + title for title in titles)
+    cached = {title: found[TITLE_CACHE_PREFIX + title] for title in titles if TITLE_CACHE_PREFIX + title in found}
+    return cached, [title for title in titles if title not in cached]
+
+def cache_titles(results: Dict[str, Dict[str, Optional[str]]]) -> None:
+    """Cache title resolutions that found a QID."""
+    get_cache().set_many(
+        {TITLE_CACHE_PREFIX + title: result for title, result in results.items() if result.get("wiki_id")},
+        TITLE_CACHE_TTL
+    )
+
+def resolve_titles(page_titles: List[str]) -> Dict[str, Dict[str, Optional[str]]]:
+    """Resolve Wikipedia page titles to their final titles and Wikidata IDs.
+
+    Redirects, title normalization and the Wikidata ID lookup all come back
+    in a single ``prop=pageprops`` query, sent for up to MAX_IDS_PER_REQUEST
+    titles at a time. Titles other threads are already resolving are not sent again.
+
+    Args:
+        page_titles: Page URL titles (end of URL), duplicates allowed
+
+    Returns:
+        Dict mapping each input title that got an API answer to
+        ``{"title": resolved title or None, "wiki_id": QID or None, "failure": LOOKUP_* reason or None}``
+    """
+    results, titles = split_cached_titles(page_titles)
+
+    def fetch_titles(titles: List[str]) -> Dict[str, Dict[str, Optional[str]]]:
+        fetched = {}
+        for i in range(0, len(titles), MAX_IDS_PER_REQUEST):
+            chunk = titles[i:i + MAX_IDS_PER_REQUEST]
+            try:
+                logger.info(f"Resolving {len(chunk)} Wikipedia pages")
+                data = fetch_wikipedia(titles_query_params(chunk))
+                chunk_results = parse_titles_response(chunk, data)
+                cache_titles(chunk_results)
+                fetched.update(chunk_results)
+            except CircuitOpenError:
+                raise
+            except Exception as e:
+                logger.error(f"Error resolving pages {', '.join(chunk)}: {str(e)}")
+        return fetched
+
+    # Titles another thread is already resolving are awaited instead of requested again
+    results.update(get_single_flight("titles").do_many(titles, fetch_titles))
+    return results
+
 def get_wiki_id_from_page(page_title: str) -> Optional[str]:
     """Get Wikidata ID from Wikipedia page title.
 
@@ -185,106 +979,577 @@ def get_wiki_id_from_page(page_title: str) -> Optional[str]:
     if not page_title:
         return None
 
-    try:
-        # First try to resolve any redirects
-        logger.info(f"Looking up WikiID for page: {page_title}")
-        resolved_title = resolve_redirect(page_title)
-        if not resolved_title:
-            logger.warning(f"Could not resolve page title: {page_title}")
-            return None
+    logger.info(f"Looking up WikiID for page: {page_title}")
+    return resolve_titles([page_title]).get(page_title, {}).get("wiki_id")
 
-        logger.info(f"Getting Wikidata ID for resolved page: {resolved_title}")
-        params = {
-            "action": "wbgetentities",
-            "format": "json",
-            "sites": "enwiki",
-            "titles": resolved_title,
-            "languages": "en",
-            "redirects": "yes"
-        }
-        
-        data = fetch_wikidata(params)
-        if not data or "entities" not in data or not data["entities"]:
-            logger.warning(f"No Wikidata entity found for page: {resolved_title}")
-            return None
+class WikidataDate(NamedTuple):
+    """A Wikidata time value with its precision.
+
+    ``year`` is negative for BCE dates, and ``month``/``day`` are 0 when they
+    are beyond the precision of the value.
+    """
+    year: int
+    month: int
+    day: int
+    precision: int
 
-        entity_id = next(iter(data["entities"]))
-        if entity_id == "-1":
-            logger.warning(f"Invalid Wikidata entity for page: {resolved_title}")
+    @property
+    def is_bce(self) -> bool:
+        return self.year < 0
+
+    def to_datetime(self) -> Optional[datetime]:
+        """Convert to a datetime, padding unknown month/day with 1.
+
+        Returns:
+            The date, or None for BCE/year 0 dates and invalid days
+        """
+        if self.year < 1:
+            return None
+        try:
+            return datetime(self.year, self.month or 1, self.day or 1)
+        except ValueError:
             return None
 
-        logger.info(f"Found Wikidata ID {entity_id} for page {resolved_title}")
-        return entity_id
-    except Exception as e:
-        logger.error(f"Error getting Wiki ID for {page_title}: {str(e)}")
+def parse_wikidata_date(value: Optional[Dict[str, Any]]) -> Optional[WikidataDate]:
+    """Parse a Wikidata time datavalue, keeping its sign and precision.
+
+    Slices the fixed-layout ``[+-]YYYY...-MM-DDThh:mm:ssZ`` string instead of
+    trying strptime formats. When the datavalue has no ``precision``, it is
+    inferred from zeroed month/day fields.
+
+    Args:
+        value: The ``datavalue.value`` dict of a time claim (needs a ``time`` key)
+
+    Returns:
+        Parsed date, or None if the value is missing or malformed
+    """
+    if not value:
+        return None
+    time_str = value.get("time")
+    if not isinstance(time_str, str) or not time_str:
         return None
 
-@lru_cache(maxsize=128)
-def get_birth_death_date(wikidata_prop_id: str, wikidata_q_number: str) -> Optional[datetime]:
-    """Get birth or death date from Wikidata.
+    sign = -1 if time_str[0] == "-" else 1
+    body = time_str[1:] if time_str[0] in "+-" else time_str
+    # Years may have more than four digits, so find the end of the year
+    year_end = body.find("-", 1)
+    try:
+        year = int(body[:year_end])
+        month = int(body[year_end + 1:year_end + 3])
+        day = int(body[year_end + 4:year_end + 6])
+    except ValueError:
+        return None
+    if year_end < 1 or not 0 <= month <= 12 or not 0 <= day <= 31:
+        return None
+
+    precision = value.get("precision")
+    if precision is None:
+        precision = PRECISION_DAY if day else PRECISION_MONTH if month else PRECISION_YEAR
+    if precision < PRECISION_DAY:
+        day = 0
+    if precision < PRECISION_MONTH:
+        month = 0
+    return WikidataDate(sign * year, month, day, precision)
+
+def parse_wikidata_dates(values: List[Optional[Dict[str, Any]]]) -> List[Optional[WikidataDate]]:
+    """Parse many Wikidata time datavalues, see parse_wikidata_date."""
+    return [parse_wikidata_date(value) for value in values]
+
+def parse_wikidata_time(value: Optional[Dict[str, Any]]) -> Optional[datetime]:
+    """Parse a Wikidata time datavalue into a datetime.
+
+    Args:
+        value: The ``datavalue.value`` dict of a time claim (needs a ``time`` key)
+
+    Returns:
+        Parsed date padded to the first of the month/year for lower precisions,
+        or None if the value is missing, cannot be parsed or is BCE
+    """
+    if not value or "time" not in value:
+        return None
+
+    parsed = parse_wikidata_date(value)
+    result = parsed.to_datetime() if parsed else None
+    if result is None:
+        logger.error(f"Error parsing date {value['time']} (precision {value.get('precision')})")
+    return result
+
+def extract_entity_facts(entity: Dict[str, Any], props: Tuple[str, ...] = ENTITY_PROPS) -> Dict[str, Any]:
+    """Extract the requested properties from a Wikidata entity in one pass.
+
+    Only the first statement's time value of each property is kept, so the
+    result stays small regardless of how large the entity document is.
+
+    Args:
+        entity: Entity document from a ``wbgetentities`` response
+        props: Property IDs to extract
+
+    Returns:
+        Dict with the entity ``id``, its ``lastrevid`` and a ``claims`` map of
+        property ID to the raw time value (or None when the property is absent)
+    """
+    claims = entity.get("claims", {})
+    facts = {"id": entity.get("id"), "lastrevid": entity.get("lastrevid"), "claims": {}}
+    for prop in props:
+        value = None
+        try:
+            value = claims[prop][0]["mainsnak"]["datavalue"]["value"]
+        except (KeyError, IndexError, TypeError):
+            pass
+        facts["claims"][prop] = value
+    return facts
+
+def facts_digest(facts: Dict[str, Any]) -> str:
+    """Hash the extracted claims of an entity.
+
+    The digest only covers the requested property values, so edits to other
+    parts of the entity do not change it.
+
+    Args:
+        facts: Entity facts from extract_entity_facts
+
+    Returns:
+        Hex SHA-256 digest of the claims
+    """
+    payload = json.dumps(facts["claims"], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def _facts_are_fresh(facts: Dict[str, Any], props: Tuple[str, ...], min_revision: Optional[int] = None) -> bool:
+    """Check that cached facts cover all requested properties and are not older than min_revision."""
+    if not set(props) <= set(facts["claims"]):
+        return False
+    return min_revision is None or (facts.get("lastrevid") or 0) >= int(min_revision)
+
+def cache_facts(facts_by_qid: Dict[str, Dict[str, Any]]) -> None:
+    """Cache extracted entity facts; only the extracted properties are stored."""
+    get_cache().set_many({FACTS_CACHE_PREFIX + q_number: facts for q_number, facts in facts_by_qid.items()})
+
+def entities_params(wikidata_q_numbers: List[str]) -> Dict[str, Any]:
+    """Build the wbgetentities request for a chunk of QIDs.
+
+    Only claims and page info (for ``lastrevid``) are requested, so labels,
+    descriptions, aliases and sitelinks are never downloaded.
+    """
+    return {
+        "action": "wbgetentities",
+        "ids": "|".join(wikidata_q_numbers),
+        "props": "info|claims",
+        "format": "json",
+        "languages": "en"
+    }
+
+def _import_ijson():
+    """Import ijson if it is installed; entity responses are parsed whole otherwise."""
+    try:
+        import ijson
+    except ImportError:
+        return None
+    return ijson
+
+class EntityStreamPruner:
+    """Rebuild a wbgetentities response from ijson events, keeping only what we read.
+
+    Only the scalar fields of each entity used by parse_entities_response and
+    the claims of the requested properties are materialized, plus top-level
+    keys such as ``error``, so memory stays flat regardless of entity size.
+    """
+
+    ENTITY_FIELDS = ("id", "type", "lastrevid", "missing")
+
+    def __init__(self, props: Tuple[str, ...] = ENTITY_PROPS):
+        self.props = set(props)
+        self.result: Dict[str, Any] = {}
+        self._builder = None
+        self._builder_prefix = None
+        self._builder_path = None
+
+    def _kept_path(self, prefix: str) -> Optional[Tuple[str, ...]]:
+        parts = tuple(prefix.split(".")) if prefix else ()
+        if len(parts) == 1 and parts[0] != "entities":
+            return parts
+        if len(parts) == 3 and parts[0] == "entities" and parts[2] in self.ENTITY_FIELDS:
+            return parts
+        if len(parts) == 4 and parts[0] == "entities" and parts[2] == "claims" and parts[3] in self.props:
+            return parts
+        return None
+
+    def _assign(self, path: Tuple[str, ...], value: Any) -> None:
+        target = self.result
+        for key in path[:-1]:
+            target = target.setdefault(key, {})
+        target[path[-1]] = value
+
+    def feed(self, prefix: str, event: str, value: Any) -> None:
+        """Consume one ``(prefix, event, value)`` event from ``ijson.parse``."""
+        if self._builder is not None:
+            self._builder.event(event, value)
+            if prefix == self._builder_prefix and event in ("end_map", "end_array"):
+                self._assign(self._builder_path, self._builder.value)
+                self._builder = None
+            return
+
+        if prefix == "entities" and event == "start_map":
+            self.result.setdefault("entities", {})
+            return
+
+        path = self._kept_path(prefix)
+        if path is None or event in ("map_key", "end_map", "end_array"):
+            return
+        if event in ("start_map", "start_array"):
+            self._builder = _import_ijson().ObjectBuilder()
+            self._builder.event(event, value)
+            self._builder_prefix = prefix
+            self._builder_path = path
+        else:
+            self._assign(path, value)
+
+class _ChunkStream:
+    """File-like view over ``response.iter_content`` for ijson.
+
+    iter_content decodes gzip and raises requests exceptions on broken
+    connections, unlike reading ``response.raw`` directly.
+    """
+
+    def __init__(self, response: requests.Response, chunk_size: int = 64 * 1024):
+        self._chunks = response.iter_content(chunk_size=chunk_size)
+
+    def read(self, size: int = -1) -> bytes:
+        # ijson probes the stream type with read(0)
+        if size == 0:
+            return b""
+        return next(self._chunks, b"")
+
+def entities_stream_parser(props: Tuple[str, ...] = ENTITY_PROPS) -> Optional[Callable[[requests.Response], Any]]:
+    """Build a fetch_wikidata parser that prunes wbgetentities responses while streaming.
+
+    Returns:
+        The parser, or None when ijson is not installed
+    """
+    ijson = _import_ijson()
+    if ijson is None:
+        return None
+
+    def parse(response: requests.Response) -> Dict[str, Any]:
+        pruner = EntityStreamPruner(props)
+        try:
+            for prefix, event, value in ijson.parse(_ChunkStream(response), use_float=True):
+                pruner.feed(prefix, event, value)
+        except ijson.JSONError as e:
+            raise ValueError(f"Invalid JSON in entity response: {e}") from e
+        return pruner.result
+
+    return parse
+
+def split_cached_facts(wikidata_q_numbers: List[str], props: Tuple[str, ...] = ENTITY_PROPS,
+                       min_revisions: Optional[Dict[str, int]] = None) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+    """Split QIDs into cached entity facts and QIDs that still need fetching.
+
+    Args:
+        wikidata_q_numbers: Wiki Data IDs (Q Numbers), duplicates allowed
+        props: Property IDs to extract
+        min_revisions: Oldest acceptable revision per QID; older cached facts are refetched
+
+    Returns:
+        Tuple of (cached facts by QID, list of QIDs missing from the cache)
+    """
+    min_revisions = min_revisions or {}
+    q_numbers = list(dict.fromkeys(q for q in wikidata_q_numbers if q))
+    found = get_cache().get_many(FACTS_CACHE_PREFIX + q_number for q_number in q_numbers)
+    cached = {}
+    missing = []
+    for q_number in q_numbers:
+        facts = found.get(FACTS_CACHE_PREFIX + q_number)
+        if facts is not None and _facts_are_fresh(facts, props, min_revisions.get(q_number)):
+            cached[q_number] = facts
+        else:
+            missing.append(q_number)
+    return cached, missing
+
+def parse_entities_response(wikidata_q_numbers: List[str], data: Optional[Dict[str, Any]],
+                            props: Tuple[str, ...] = ENTITY_PROPS) -> Dict[str, Dict[str, Any]]:
+    """Extract and cache facts for each requested entity in a wbgetentities response.
+
+    Args:
+        wikidata_q_numbers: QIDs sent in the request
+        data: JSON response of the request
+        props: Property IDs to extract
+
+    Returns:
+        Dict mapping each valid QID to its entity facts
+    """
+    results = {}
+    if not data or "entities" not in data:
+        logger.warning(f"Invalid data for entities {', '.join(wikidata_q_numbers)}")
+        return results
+
+    for q_number in wikidata_q_numbers:
+        entity = data["entities"].get(q_number)
+        if not entity or "missing" in entity:
+            logger.warning(f"Invalid data for {q_number}")
+            continue
+        results[q_number] = extract_entity_facts(entity, props)
+    cache_facts(results)
+    return results
+
+def get_entities_facts(wikidata_q_numbers: List[str], props: Tuple[str, ...] = ENTITY_PROPS,
+                       min_revisions: Optional[Dict[str, int]] = None) -> Dict[str, Dict[str, Any]]:
+    """Fetch many Wikidata entities with as few requests as possible.
+
+    Cached entities are served from the lookup cache; the rest are requested in chunks
+    of up to MAX_IDS_PER_REQUEST ids per ``wbgetentities`` call, sharing requests
+    other threads already have in flight.
+
+    Args:
+        wikidata_q_numbers: Wiki Data IDs (Q Numbers), duplicates allowed
+        props: Property IDs to extract
+        min_revisions: Oldest acceptable revision per QID, e.g. from get_latest_revisions
+
+    Returns:
+        Dict mapping each QID that could be fetched to its entity facts
+    """
+    results, missing = split_cached_facts(wikidata_q_numbers, props, min_revisions)
+
+    def fetch_entities(q_numbers: List[str]) -> Dict[str, Dict[str, Any]]:
+        fetched = {}
+        for i in range(0, len(q_numbers), MAX_IDS_PER_REQUEST):
+            chunk = q_numbers[i:i + MAX_IDS_PER_REQUEST]
+            try:
+                logger.info(f"Getting {', '.join(props)} for {len(chunk)} entities")
+                data = fetch_wikidata(entities_params(chunk), parser=entities_stream_parser(props))
+                fetched.update(parse_entities_response(chunk, data, props))
+            except CircuitOpenError:
+                raise
+            except Exception as e:
+                logger.error(f"Error getting entities {', '.join(chunk)}: {str(e)}")
+        return fetched
+
+    # QIDs another thread is already fetching with the same props are awaited instead of requested again
+    results.update(get_single_flight("entities").do_many(missing, fetch_entities, scope=props))
+    return results
+
+def get_entity_facts(wikidata_q_number: str, props: Tuple[str, ...] = ENTITY_PROPS) -> Optional[Dict[str, Any]]:
+    """Fetch a Wikidata entity once and extract all requested properties.
+
+    Results are cached per QID, so asking for birth and death dates of the
+    same person costs a single ``wbgetentities`` request.
 
     Args:
-        wikidata_prop_id: Property ID, P569 (birth) or P570 (death)
         wikidata_q_number: Wiki Data ID (Q Number)
+        props: Property IDs to extract
 
     Returns:
-        Date of the requested entity, or None if not found
+        Entity facts as returned by extract_entity_facts, or None on failure
     """
     if not wikidata_q_number:
         return None
+    return get_entities_facts([wikidata_q_number], props).get(wikidata_q_number)
 
-    try:
-        logger.info(f"Getting {wikidata_prop_id} for entity {wikidata_q_number}")
-        params = {
-            "action": "wbgetentities",
-            "ids": wikidata_q_number,
-            "format": "json",
-            "languages": "en"
-        }
+def revisions_params(wikidata_q_numbers: List[str]) -> Dict[str, Any]:
+    """Build the ``prop=info`` request returning the latest revision of item pages."""
+    return {
+        "action": "query",
+        "prop": "info",
+        "titles": "|".join(wikidata_q_numbers),
+        "format": "json"
+    }
 
-        data = fetch_wikidata(params)
-        if not data or "entities" not in data or wikidata_q_number not in data["entities"]:
-            logger.warning(f"Invalid data for {wikidata_q_number}")
-            return None
+def parse_revisions_response(wikidata_q_numbers: List[str], data: Optional[Dict[str, Any]]) -> Dict[str, int]:
+    """Map each QID in a ``prop=info`` response to its ``lastrevid``.
 
-        claims = data["entities"][wikidata_q_number]["claims"]
-        if wikidata_prop_id not in claims:
-            logger.info(f"Property {wikidata_prop_id} not found for {wikidata_q_number}")
-            return None
+    Args:
+        wikidata_q_numbers: QIDs sent in the request
+        data: JSON response of the request
+
+    Returns:
+        Dict mapping each existing QID to its latest revision ID
+    """
+    if not data or "query" not in data:
+        logger.warning(f"Invalid revision data for entities {', '.join(wikidata_q_numbers)}")
+        return {}
+
+    requested = set(wikidata_q_numbers)
+    revisions = {}
+    for page in data["query"].get("pages", {}).values():
+        title = page.get("title")
+        if title in requested and "missing" not in page and page.get("lastrevid"):
+            revisions[title] = page["lastrevid"]
+    return revisions
+
+def get_latest_revisions(wikidata_q_numbers: List[str]) -> Dict[str, int]:
+    """Get the current revision ID of many Wikidata entities.
 
-        date_str = claims[wikidata_prop_id][0]["mainsnak"]["datavalue"]["value"]["time"]
-        logger.info(f"Found date {date_str} for {wikidata_prop_id} on {wikidata_q_number}")
+    Much cheaper than ``wbgetentities``: only page info is returned, for up to
+    MAX_IDS_PER_REQUEST entities per request.
 
-        # Remove leading +/- from date string
-        if date_str.startswith(("+", "-")):
-            date_str = date_str[1:]
+    Args:
+        wikidata_q_numbers: Wiki Data IDs (Q Numbers), duplicates allowed
 
+    Returns:
+        Dict mapping each QID that could be checked to its latest revision ID
+    """
+    q_numbers = list(dict.fromkeys(q for q in wikidata_q_numbers if q))
+    revisions = {}
+    for i in range(0, len(q_numbers), MAX_IDS_PER_REQUEST):
+        chunk = q_numbers[i:i + MAX_IDS_PER_REQUEST]
         try:
-            if date_str.endswith("-00-00T00:00:00Z"):
-                date_obj = datetime.strptime(date_str, "%Y-00-00T00:00:00Z")
-            elif date_str[5:7] != "00" and date_str.endswith("-00T00:00:00Z"):
-                date_obj = datetime.strptime(date_str, "%Y-%m-00T00:00:00Z")
-            else:
-                date_obj = datetime.strptime(date_str, "%Y-%m-%dT%H:%M:%SZ")
-            return date_obj
-        except ValueError as e:
-            logger.error(f"Error parsing date {date_str}: {str(e)}")
-            return None
+            logger.info(f"Checking revisions of {len(chunk)} entities")
+            revisions.update(parse_revisions_response(chunk, fetch_wikidata(revisions_params(chunk))))
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            logger.error(f"Error checking revisions of {', '.join(chunk)}: {str(e)}")
+    return revisions
 
-    except Exception as e:
-        logger.error(f"Error getting date for {wikidata_q_number}: {str(e)}")
+def revision_only_facts(wikidata_q_number: str, revision: int) -> Dict[str, Any]:
+    """Build placeholder facts for an entity known to be unchanged.
+
+    They carry the revision but no claims, so they are only good for the
+    revision short-circuit of persons whose stored WikiRevId matches.
+    """
+    return {"id": wikidata_q_number, "lastrevid": revision, "claims": {}, "revisionOnly": True}
+
+def get_fact_date(facts: Optional[Dict[str, Any]], wikidata_prop_id: str) -> Optional[datetime]:
+    """Get a parsed date for one property out of extracted entity facts."""
+    if not facts:
+        return None
+
+    value = facts["claims"].get(wikidata_prop_id)
+    if value is None:
+        logger.info(f"Property {wikidata_prop_id} not found for {facts.get('id')}")
         return None
 
-def calculate_age(birth_date: datetime, death_date: Optional[datetime] = None) -> int:
-    """Calculate age based on birth date and optional death date."""
+    logger.info(f"Found date {value.get('time')} for {wikidata_prop_id} on {facts.get('id')}")
+    return parse_wikidata_time(value)
+
+def get_birth_death_date(wikidata_prop_id: str, wikidata_q_number: str) -> Optional[datetime]:
+    """Get birth or death date from Wikidata.
+
+    Args:
+        wikidata_prop_id: Property ID, P569 (birth) or P570 (death)
+        wikidata_q_number: Wiki Data ID (Q Number)
+
+    Returns:
+        Date of the requested entity, or None if not found
+    """
+    props = ENTITY_PROPS if wikidata_prop_id in ENTITY_PROPS else (wikidata_prop_id,)
+    return get_fact_date(get_entity_facts(wikidata_q_number, props), wikidata_prop_id)
+
+def get_birth_death_dates(wikidata_q_numbers: List[str]) -> Dict[str, Dict[str, Optional[datetime]]]:
+    """Get birth and death dates for many entities using batched requests.
+
+    Args:
+        wikidata_q_numbers: Wiki Data IDs (Q Numbers)
+
+    Returns:
+        Dict mapping each fetched QID to ``{"birth": date, "death": date}``
+    """
+    return {
+        q_number: {
+            "birth": get_fact_date(facts, BIRTH_DATE_PROP),
+            "death": get_fact_date(facts, DEATH_DATE_PROP)
+        }
+        for q_number, facts in get_entities_facts(wikidata_q_numbers).items()
+    }
+
+def calculate_age(birth_date: datetime, death_date: Optional[datetime] = None,
+                  as_of: Optional[datetime] = None) -> int:
+    """Calculate age based on birth date and optional death date.
+
+    Living persons are aged as of today, or as of ``as_of`` when given.
+    """
     if not birth_date:
         return 0
 
-    end_date = death_date if death_date else datetime.now()
+    end_date = death_date if death_date else (as_of or datetime.now())
     age = end_date.year - birth_date.year
 
     # Adjust age if birthday hasn't occurred this year
     if (end_date.month, end_date.day) < (birth_date.month, birth_date.day):
         age -= 1
 
-    return max(0, age)
\ No newline at end of file
+    return max(0, age)
+
+def _import_numpy():
+    """Import NumPy if it is installed; bulk age computation falls back to pure Python otherwise."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+def _coerce_date(value: Any) -> Optional[datetime]:
+    """Convert a datetime, date or ISO date string to a datetime.
+
+    Partial strings are padded like parse_wikidata_time does: ``YYYY`` becomes
+    January 1st and ``YYYY-MM`` the first of the month. None, empty strings and
+    NaT become None.
+    """
+    if value is None or value == "" or str(value) == "NaT":
+        return None
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    parts = str(value)[:10].split("-")
+    if not 1 <= len(parts) <= 3:
+        raise ValueError(f"Invalid date {value!r}")
+    year, month, day = (int(part) for part in parts + ["1"] * (3 - len(parts)))
+    return datetime(year, month, day)
+
+def _bulk_ages_numpy(np, birth_dates, death_dates, as_of: datetime) -> List[int]:
+    """Vectorized calculate_age over datetime64[D] arrays."""
+    births = np.asarray(birth_dates, dtype="datetime64[D]")
+    ends = np.full(births.shape, np.datetime64(as_of.strftime("%Y-%m-%d"), "D"))
+    if death_dates is not None:
+        deaths = np.asarray(death_dates, dtype="datetime64[D]")
+        ends = np.where(np.isnat(deaths), ends, deaths)
+
+    def year_and_month_day(dates):
+        months = dates.astype("datetime64[M]")
+        month_day = (months.astype(np.int64) % 12 + 1) * 100 + (dates - months).astype(np.int64) + 1
+        return dates.astype("datetime64[Y]").astype(np.int64), month_day
+
+    birth_years, birth_month_days = year_and_month_day(births)
+    end_years, end_month_days = year_and_month_day(ends)
+
+    # Adjust age if birthday hasn't occurred in the end year
+    ages = end_years - birth_years - (end_month_days < birth_month_days)
+    ages = np.maximum(ages, 0)
+    ages[np.isnat(births)] = 0
+    return ages.tolist()
+
+def bulk_calculate_ages(birth_dates: Any, death_dates: Any = None, as_of: Optional[datetime] = None,
+                        use_numpy: Optional[bool] = None) -> List[int]:
+    """Calculate the ages of many persons in one call.
+
+    Gives the same result as calling calculate_age on each pair, including
+    partial-precision dates: year-only and year-month values count from the
+    first day of the year or month, as parse_wikidata_time does. Uses NumPy
+    when it is installed and falls back to a pure-Python loop otherwise.
+
+    Args:
+        birth_dates: Sequence or NumPy array of birth dates (datetime, date,
+            datetime64 or ``YYYY``/``YYYY-MM``/``YYYY-MM-DD`` strings; None for unknown)
+        death_dates: Same-length sequence of death dates, None entries for living persons
+        as_of: Date living persons are aged as of (defaults to today)
+        use_numpy: Force (True) or disable (False) the NumPy implementation
+
+    Returns:
+        List of ages, 0 where the birth date is unknown
+
+    Raises:
+        ValueError: If a date string cannot be parsed
+    """
+    as_of = as_of or datetime.now()
+    np = _import_numpy() if use_numpy is not False else None
+    if use_numpy and np is None:
+        raise ImportError("NumPy is not installed")
+    if np is not None:
+        return _bulk_ages_numpy(np, birth_dates, death_dates, as_of)
+
+    if death_dates is None:
+        death_dates = [None] * len(birth_dates)
+    return [
+        calculate_age(_coerce_date(birth_date), _coerce_date(death_date), as_of)
+        for birth_date, death_date in zip(birth_dates, death_dates)
+    ]
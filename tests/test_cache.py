@@ -0,0 +1,103 @@
+"""
+Tests for the DynamoDB cache tier against moto's DynamoDB stand-in
+"""
+
+import os
+import sys
+import time
+
+import boto3
+import pytest
+
+moto = pytest.importorskip("moto")
+
+# Add the src directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+from utils.cache import DynamoDBTier, MemoryTier, TieredCache, create_dynamodb_cache_table
+
+TABLE_NAME = "deadpool-wiki-cache-test"
+
+class CountingResource:
+    """Wraps a DynamoDB resource, counting BatchGetItem calls and optionally
+    holding back keys as UnprocessedKeys on the first call."""
+
+    def __init__(self, resource, unprocessed_first: int = 0):
+        self._resource = resource
+        self.unprocessed_first = unprocessed_first
+        self.batch_get_calls = []
+
+    def batch_get_item(self, RequestItems):
+        keys = RequestItems[TABLE_NAME]["Keys"]
+        self.batch_get_calls.append(len(keys))
+        held_back = []
+        if self.unprocessed_first:
+            held_back, keys = keys[:self.unprocessed_first], keys[self.unprocessed_first:]
+            self.unprocessed_first = 0
+        response = self._resource.batch_get_item(RequestItems={TABLE_NAME: dict(RequestItems[TABLE_NAME], Keys=keys)})
+        if held_back:
+            response["UnprocessedKeys"] = {TABLE_NAME: {"Keys": held_back}}
+        return response
+
+    def __getattr__(self, name):
+        return getattr(self._resource, name)
+
+@pytest.fixture
+def resource(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    with moto.mock_aws():
+        resource = boto3.resource("dynamodb")
+        create_dynamodb_cache_table(TABLE_NAME, resource=resource)
+        yield resource
+
+def test_set_and_get_many_in_batches_of_100(resource):
+    counting = CountingResource(resource)
+    tier = DynamoDBTier(TABLE_NAME, resource=counting)
+    expires_at = time.time() + 60
+    tier.set_many({f"k{i}": ({"v": i}, expires_at) for i in range(250)})
+
+    found = tier.get_many([f"k{i}" for i in range(250)] + ["k0", "missing"])
+
+    assert len(found) == 250
+    assert found["k7"] == ({"v": 7}, float(int(expires_at)))
+    assert counting.batch_get_calls == [100, 100, 51]
+    assert tier.stats()["hits"] == 250
+    assert tier.stats()["misses"] == 1
+
+def test_get_many_retries_unprocessed_keys(resource):
+    counting = CountingResource(resource, unprocessed_first=3)
+    tier = DynamoDBTier(TABLE_NAME, resource=counting)
+    tier.set_many({f"k{i}": (i, time.time() + 60) for i in range(10)})
+
+    found = tier.get_many([f"k{i}" for i in range(10)])
+
+    assert {key: value for key, (value, _) in found.items()} == {f"k{i}": i for i in range(10)}
+    assert counting.batch_get_calls == [10, 3]
+
+def test_get_many_skips_expired_items(resource):
+    tier = DynamoDBTier(TABLE_NAME, resource=resource)
+    now = time.time()
+    tier.set_many({"fresh": (1, now + 60), "expired": (2, now - 5)})
+
+    assert list(tier.get_many(["fresh", "expired"])) == ["fresh"]
+
+def test_delete_and_clear(resource):
+    tier = DynamoDBTier(TABLE_NAME, resource=resource)
+    tier.set_many({key: (key, time.time() + 60) for key in ("a", "b", "c")})
+
+    tier.delete(["a", "a", "missing"])
+    assert sorted(tier.get_many(["a", "b", "c"])) == ["b", "c"]
+
+    tier.clear()
+    assert tier.get_many(["b", "c"]) == {}
+
+def test_promotion_keeps_the_remaining_ttl(resource):
+    memory = MemoryTier()
+    shared = DynamoDBTier(TABLE_NAME, resource=resource)
+    cache = TieredCache([memory, shared], default_ttl=3600)
+    expires_at = int(time.time() + 30)
+    shared.set_many({"k": ("v", expires_at)})
+
+    assert cache.get("k") == "v"
+    assert memory.get_many(["k"]) == {"k": ("v", float(expires_at))}